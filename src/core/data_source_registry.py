@@ -5,8 +5,8 @@ import time
 from typing import Any, Dict, List, Optional, Tuple
 
 from src.core.models import DataSourcePriority, SourceMeta
-from src.data_sources.base import BaseDataSource
-from src.middleware.cache import cache_manager
+from src.data_sources.base import BaseDataSource, close_shared_transport
+from src.middleware.cache import SingleFlight, cache_manager
 from src.utils.config import config
 from src.utils.exceptions import AllSourcesFailedError, DataSourceError
 from src.utils.logger import get_logger
@@ -19,6 +19,8 @@ class DataSourceRegistry:
 
     def __init__(self):
         self._sources: Dict[str, BaseDataSource] = {}
+        # 缓存未命中时，同一cache_key只回源一次
+        self._inflight = SingleFlight()
 
     def register(self, name: str, source: BaseDataSource):
         """
@@ -125,6 +127,24 @@ class DataSourceRegistry:
                 # 旧格式缓存，无SourceMeta
                 return cached_data, None
 
+        # 2-4. 回源（并发的同键未命中共享同一次回源）
+        return await self._inflight.do(
+            cache_key,
+            lambda: self._fetch_from_chain(
+                tool_name, capability, endpoint, params, data_type, cache_key
+            ),
+        )
+
+    async def _fetch_from_chain(
+        self,
+        tool_name: str,
+        capability: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        data_type: str,
+        cache_key: str,
+    ) -> Tuple[Dict[str, Any], SourceMeta]:
+        """按fallback链依次尝试数据源并写入缓存"""
         # 2. 获取fallback链
         chain = self.get_fallback_chain(tool_name, capability)
 
@@ -220,6 +240,9 @@ class DataSourceRegistry:
             except Exception as e:
                 logger.error(f"Failed to close {name}", error=str(e))
 
+        # 关闭所有数据源共享的连接池
+        await close_shared_transport()
+
 
 # 全局注册表实例
 registry = DataSourceRegistry()
@@ -18,6 +18,7 @@ class SourceMetaBuilder:
         degraded: bool = False,
         fallback_used: Optional[str] = None,
         response_time_ms: Optional[float] = None,
+        as_of_utc: Optional[str] = None,
     ) -> SourceMeta:
         """
         构建SourceMeta
@@ -29,6 +30,7 @@ class SourceMetaBuilder:
             degraded: 是否降级模式
             fallback_used: 使用的备用源
             response_time_ms: 响应时间（毫秒）
+            as_of_utc: 数据时间戳（默认当前时间；缓存命中时传入原始获取时间）
 
         Returns:
             SourceMeta实例
@@ -36,7 +38,8 @@ class SourceMetaBuilder:
         return SourceMeta(
             provider=provider,
             endpoint=endpoint,
-            as_of_utc=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            as_of_utc=as_of_utc
+            or datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
             ttl_seconds=ttl_seconds,
             degraded=degraded,
             fallback_used=fallback_used,
@@ -1,12 +1,24 @@
 """
 数据源抽象基类
 """
+import asyncio
+import copy
+import importlib.util
+import json
+import re
 import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from src.core.models import SourceMeta
 from src.core.source_meta import SourceMetaBuilder
 from src.middleware import (
@@ -16,6 +28,7 @@ from src.middleware import (
     global_rate_limiter_registry,
     with_retry,
 )
+from src.middleware.cache import TTLCache
 from src.utils.config import config
 from src.utils.exceptions import (
     DataSourceAuthError,
@@ -27,10 +40,80 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 连续20位以上的数字可能超出64位整数范围（如链上 uint256 金额），
+# orjson 会把这类整数静默转成 float 丢失精度，需交给标准库解析
+_WIDE_INT_RE = re.compile(rb"\d{20}")
+
+# 安装了 h2（httpx[http2]）时启用HTTP/2，同一主机的并发请求复用单条连接
+HAS_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# 所有数据源共享的HTTP传输层（连接池），复用到同一主机的TCP/TLS连接；
+# 连接绑定创建它的事件循环，因此按事件循环分别维护，循环被回收后自动移除
+# 事件循环 -> httpx.AsyncHTTPTransport
+_shared_transports: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """当前运行中的事件循环（不在事件循环中时返回None）"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_shared_transport(
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+) -> httpx.AsyncHTTPTransport:
+    """
+    获取事件循环对应的共享HTTP传输层（懒加载）
+
+    Args:
+        loop: 事件循环（默认当前运行中的循环）
+    """
+    loop = loop or asyncio.get_running_loop()
+    transport = _shared_transports.get(loop)
+    if transport is None:
+        transport = _shared_transports[loop] = httpx.AsyncHTTPTransport(
+            http2=HAS_HTTP2,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=60.0,
+            ),
+        )
+    return transport
+
+
+async def close_shared_transport():
+    """关闭当前事件循环的共享HTTP传输层（仅在应用关闭时调用）"""
+    transport = _shared_transports.pop(asyncio.get_running_loop(), None)
+    if transport is not None:
+        await transport.aclose()
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """
+    共享传输层的非拥有包装
+
+    客户端关闭时只关闭此包装，不会关闭所有数据源共用的底层连接池
+    """
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
 
 class BaseDataSource(ABC):
     """数据源抽象基类"""
 
+    # 是否默认启用进程内响应缓存（子类可覆盖；fetch 的 local_cache 参数可按次覆盖）
+    LOCAL_RESPONSE_CACHE: bool = False
+
     def __init__(
         self,
         name: str,
@@ -40,6 +123,8 @@ class BaseDataSource(ABC):
         enable_circuit_breaker: bool = True,
         circuit_failure_threshold: int = 5,
         circuit_recovery_timeout: float = 60.0,
+        circuit_half_open_success_threshold: int = 2,
+        circuit_half_open_max_concurrent: Optional[int] = 1,
     ):
         """
         初始化数据源
@@ -52,6 +137,8 @@ class BaseDataSource(ABC):
             enable_circuit_breaker: 是否启用断路器
             circuit_failure_threshold: 断路器失败阈值
             circuit_recovery_timeout: 断路器恢复超时（秒）
+            circuit_half_open_success_threshold: 半开状态下关闭断路器所需的连续成功次数
+            circuit_half_open_max_concurrent: 半开状态下同时进行的探测请求上限
         """
         self.name = name
         self.base_url = base_url.rstrip("/")
@@ -67,6 +154,12 @@ class BaseDataSource(ABC):
             )
 
         self._client: Optional[httpx.AsyncClient] = None
+        # 创建 _client 时所在的事件循环（换循环后需重建客户端）
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # 进程内响应缓存（按需启用，按 endpoint + params 去重，TTL 取自 fetch 的 ttl_seconds）；
+        # 条目为 (转换后数据, 获取时间)，读写都做深拷贝，调用方修改不会互相影响
+        self._response_cache = TTLCache(maxsize=4096)
 
         # 初始化断路器
         self.circuit_breaker: Optional[CircuitBreaker] = None
@@ -75,6 +168,8 @@ class BaseDataSource(ABC):
                 name=name,
                 failure_threshold=circuit_failure_threshold,
                 recovery_timeout=circuit_recovery_timeout,
+                half_open_success_threshold=circuit_half_open_success_threshold,
+                half_open_max_concurrent=circuit_half_open_max_concurrent,
             )
 
         # 获取速率限制器（从全局注册表）
@@ -84,25 +179,54 @@ class BaseDataSource(ABC):
         if not self.rate_limiter:
             # 如果没有预注册，尝试自动注册
             self.rate_limiter = global_rate_limiter_registry.register(name)
+        # 缓存已绑定的acquire，请求热路径上直接调用
+        self._rate_limit_acquire = global_rate_limiter_registry.make_acquire(name)
+        # 按端点独立限流的 (端点前缀, 限制器)，匹配的端点不再占用数据源级配额
+        self._endpoint_limiters = global_rate_limiter_registry.register_endpoints(name)
 
     @property
     def client(self) -> httpx.AsyncClient:
-        """获取HTTP客户端（懒加载）"""
-        if self._client is None:
-            headers = self._get_headers()
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                headers=headers,
-                timeout=self.timeout,
-                follow_redirects=True,
-            )
+        """
+        获取HTTP客户端（懒加载）
+
+        在事件循环中创建时，底层连接池在同一循环的所有数据源间共享；
+        事件循环更换后（如每次 asyncio.run）自动按新循环重建
+        """
+        loop = _running_loop()
+        if self._client is not None and (
+            self._client_loop is None or loop is None or self._client_loop is loop
+        ):
+            return self._client
+
+        # 不在事件循环中时使用客户端自有的连接池
+        transport = _SharedTransport(get_shared_transport(loop)) if loop else None
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self._get_headers(),
+            timeout=self.timeout,
+            follow_redirects=True,
+            transport=transport,
+        )
+        self._client_loop = loop
         return self._client
 
     async def close(self):
-        """关闭HTTP客户端"""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """
+        关闭HTTP客户端
+
+        共享连接池不在此关闭（客户端持有的是非拥有包装），
+        由应用关闭时调用 close_shared_transport() 统一释放
+        """
+        client, self._client = self._client, None
+        self._client_loop = None
+        if client is not None:
+            await client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
 
     @abstractmethod
     def _get_headers(self) -> Dict[str, str]:
@@ -155,6 +279,7 @@ class BaseDataSource(ABC):
         ttl_seconds: int = 300,
         base_url_override: Optional[str] = None,
         headers: Optional[Dict[str, str]] = None,
+        local_cache: Optional[bool] = None,
     ) -> tuple[Dict[str, Any], SourceMeta]:
         """
         获取并转换数据的完整流程
@@ -166,16 +291,46 @@ class BaseDataSource(ABC):
             ttl_seconds: TTL秒数
             base_url_override: 可选的基础URL覆盖
             headers: 可选的自定义请求头
+            local_cache: 是否使用进程内响应缓存（None 时取 LOCAL_RESPONSE_CACHE）
 
         Returns:
             (转换后的数据, SourceMeta)
         """
         start_time = time.time()
 
+        if local_cache is None:
+            local_cache = self.LOCAL_RESPONSE_CACHE
+
+        cache_key = None
+        if local_cache and config.settings.enable_cache:
+            cache_key = (
+                base_url_override,
+                endpoint,
+                json.dumps(params, sort_keys=True, default=str) if params else "",
+                json.dumps(headers, sort_keys=True) if headers else "",
+                data_type,
+            )
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                cached_data, fetched_at = cached
+                logger.debug(
+                    f"Local cache hit for {self.name}",
+                    provider=self.name,
+                    endpoint=endpoint,
+                )
+                source_meta = SourceMetaBuilder.build(
+                    provider=self.name,
+                    endpoint=endpoint,
+                    ttl_seconds=ttl_seconds,
+                    response_time_ms=(time.time() - start_time) * 1000,
+                    as_of_utc=fetched_at,
+                )
+                return copy.deepcopy(cached_data), source_meta
+
         try:
             # 使用断路器保护
             if self.circuit_breaker:
-                raw_data = await self.circuit_breaker.call(
+                raw_data = await self.circuit_breaker.acall(
                     self._fetch_with_retry, endpoint, params, base_url_override, headers
                 )
             else:
@@ -195,6 +350,13 @@ class BaseDataSource(ABC):
                 response_time_ms=response_time_ms,
             )
 
+            if cache_key is not None:
+                self._response_cache.set(
+                    cache_key,
+                    (copy.deepcopy(transformed_data), source_meta.as_of_utc),
+                    ttl_seconds,
+                )
+
             logger.info(
                 f"Successfully fetched from {self.name}",
                 provider=self.name,
@@ -244,9 +406,12 @@ class BaseDataSource(ABC):
             原始数据
         """
         # 速率限制检查
+        acquire = self._rate_limit_acquire
+        if self._endpoint_limiters:
+            acquire = self._limiter_for(endpoint).acquire
         if self.rate_limiter:
             # 等待获取速率限制许可（最多等待30秒）
-            allowed = await self.rate_limiter.acquire(wait=True, timeout=30.0)
+            allowed = await acquire(wait=True, timeout=30.0)
             if not allowed:
                 raise DataSourceRateLimitError(
                     self.name,
@@ -255,6 +420,48 @@ class BaseDataSource(ABC):
 
         return await self.fetch_raw(endpoint, params, base_url_override, headers)
 
+    async def fetch_raw_many(
+        self, requests: List[Tuple[str, Optional[Dict]]]
+    ) -> List[Any]:
+        """
+        并发获取多个请求的原始数据，速率许可一次性批量获取
+
+        许可数超过令牌桶容量时按容量分批获取（超过容量的单批永远无法满足）。
+
+        Args:
+            requests: (endpoint, params) 列表
+
+        Returns:
+            与 requests 顺序对应的原始数据，失败的请求对应异常对象
+
+        Raises:
+            DataSourceRateLimitError: 无法在超时内获取速率许可
+        """
+        if self.rate_limiter and requests:
+            # 按限制器汇总所需许可（配置了按端点限流时各端点分别计数）
+            needed: Dict[RateLimiter, int] = {}
+            for endpoint, _ in requests:
+                limiter = self._limiter_for(endpoint)
+                needed[limiter] = needed.get(limiter, 0) + 1
+
+            for limiter, remaining in needed.items():
+                bucket = limiter.token_bucket
+                step = max(1, bucket.capacity) if bucket else remaining
+                while remaining > 0:
+                    count = min(remaining, step)
+                    allowed = await limiter.acquire_many(count, wait=True, timeout=30.0)
+                    if not allowed:
+                        raise DataSourceRateLimitError(
+                            self.name,
+                            "Rate limit exceeded and could not acquire permits",
+                        )
+                    remaining -= count
+
+        return await asyncio.gather(
+            *[self.fetch_raw(endpoint, params) for endpoint, params in requests],
+            return_exceptions=True,
+        )
+
     async def _make_request(
         self,
         method: str,
@@ -309,13 +516,15 @@ class BaseDataSource(ABC):
             elif response.status_code == 404:
                 raise DataSourceNotFoundError(self.name, f"Resource not found: {endpoint}")
             elif response.status_code == 429:
+                if self.rate_limiter:
+                    self._limiter_for(endpoint).pause(self._get_retry_after(response))
                 raise DataSourceRateLimitError(self.name, "Rate limit exceeded")
             elif response.status_code >= 400:
                 raise Exception(
                     f"HTTP {response.status_code}: {response.text[:200]}"
                 )
 
-            return response.json()
+            return self._parse_json(response)
 
         except httpx.TimeoutException:
             raise DataSourceTimeoutError(
@@ -324,6 +533,55 @@ class BaseDataSource(ABC):
         except httpx.HTTPError as e:
             raise Exception(f"HTTP error: {str(e)}")
 
+    @staticmethod
+    def _parse_json(response: httpx.Response) -> Any:
+        """
+        解析JSON响应
+
+        orjson直接解析字节，大体量JSON（K线、推文）解析更快；
+        含超宽整数或 NaN/Infinity 的响应由标准库解析（保留精度、兼容非标准字面量）
+        """
+        content = response.content
+        if HAS_ORJSON and not _WIDE_INT_RE.search(content):
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+        return response.json()
+
+    def _limiter_for(self, endpoint: str) -> RateLimiter:
+        """端点对应的限制器：匹配按端点配置的前缀，否则为数据源级限制器"""
+        for prefix, limiter in self._endpoint_limiters:
+            if endpoint.startswith(prefix):
+                return limiter
+        return self.rate_limiter
+
+    @staticmethod
+    def _get_retry_after(response: httpx.Response) -> float:
+        """
+        从429响应头解析需要等待的秒数
+
+        支持标准 Retry-After（秒）和 x-rate-limit-reset（Unix秒，Twitter）
+
+        Returns:
+            等待秒数，无法解析时返回0
+        """
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+
+        reset_at = response.headers.get("x-rate-limit-reset")
+        if reset_at:
+            try:
+                return max(0.0, float(reset_at) - time.time())
+            except ValueError:
+                pass
+
+        return 0.0
+
     async def health_check(self) -> bool:
         """
         健康检查
@@ -280,29 +280,24 @@ class EtherscanClient(BaseDataSource):
             "action": "gasoracle",
         }
 
-        # 并行获取所有数据
-        try:
-            import asyncio
-            tx_24h_data, tx_7d_data, addr_24h_data, addr_7d_data, new_addr_data, gas_used_data, gas_price_data = await asyncio.gather(
-                self.fetch_raw("", tx_24h_params),
-                self.fetch_raw("", tx_7d_params),
-                self.fetch_raw("", addr_24h_params),
-                self.fetch_raw("", addr_7d_params),
-                self.fetch_raw("", new_addr_params),
-                self.fetch_raw("", gas_used_params),
-                self.fetch_raw("", gas_price_params),
-                return_exceptions=True,
-            )
-        except Exception as e:
-            logger.warning(f"Failed to fetch some chain stats: {e}")
-            # 如果并行获取失败，逐个获取
-            tx_24h_data = await self.fetch_raw("", tx_24h_params)
-            tx_7d_data = await self.fetch_raw("", tx_7d_params)
-            addr_24h_data = await self.fetch_raw("", addr_24h_params)
-            addr_7d_data = await self.fetch_raw("", addr_7d_params)
-            new_addr_data = await self.fetch_raw("", new_addr_params)
-            gas_used_data = await self.fetch_raw("", gas_used_params)
-            gas_price_data = await self.fetch_raw("", gas_price_params)
+        # 并行获取所有数据（一次性获取7个速率许可）
+        (
+            tx_24h_data,
+            tx_7d_data,
+            addr_24h_data,
+            addr_7d_data,
+            new_addr_data,
+            gas_used_data,
+            gas_price_data,
+        ) = await self.fetch_raw_many([
+            ("", tx_24h_params),
+            ("", tx_7d_params),
+            ("", addr_24h_params),
+            ("", addr_7d_params),
+            ("", new_addr_params),
+            ("", gas_used_params),
+            ("", gas_price_params),
+        ])
 
         # 解析24小时交易数
         tx_count_24h = None
@@ -65,6 +65,12 @@ class TelegramScraperClient(BaseDataSource):
             )
         return self._client
 
+    async def close(self):
+        """关闭HTTP客户端（独立连接池，不使用共享传输层）"""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
     async def fetch_raw(
         self,
         endpoint: str,
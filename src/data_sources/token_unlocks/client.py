@@ -10,6 +10,18 @@ from typing import Any, Dict, List, Optional
 from src.core.models import SourceMeta, TokenUnlockEvent, TokenUnlocksData
 from src.data_sources.base import BaseDataSource
 
+# 解锁事件字段别名表: (标准字段, 主字段名, 备用字段名, 默认值)
+# 备用字段只在主字段缺失时才查找，避免 item.get(a, item.get(b)) 的重复查找
+_UNLOCK_FIELD_ALIASES = (
+    ("project", "project", "name", ""),
+    ("token_symbol", "token_symbol", "symbol", ""),
+    ("unlock_date", "unlock_date", "date", ""),
+    ("unlock_amount", "unlock_amount", "amount", 0),
+    ("unlock_value_usd", "unlock_value_usd", "value_usd", None),
+    ("percentage_of_supply", "percentage_of_supply", "percent", None),
+    ("cliff_type", "cliff_type", "type", "unknown"),
+)
+
 
 class TokenUnlocksClient(BaseDataSource):
     """Token Unlocks API客户端"""
@@ -160,22 +172,21 @@ class TokenUnlocksClient(BaseDataSource):
         #   ]
         # }
 
-        data_list = raw_data.get("data", [])
         if isinstance(raw_data, list):
             data_list = raw_data
+        else:
+            data_list = raw_data.get("data", [])
 
         events = []
         for item in data_list:
-            events.append({
-                "project": item.get("project", item.get("name", "")),
-                "token_symbol": item.get("token_symbol", item.get("symbol", "")),
-                "unlock_date": item.get("unlock_date", item.get("date", "")),
-                "unlock_amount": item.get("unlock_amount", item.get("amount", 0)),
-                "unlock_value_usd": item.get("unlock_value_usd", item.get("value_usd")),
-                "percentage_of_supply": item.get("percentage_of_supply", item.get("percent")),
-                "cliff_type": item.get("cliff_type", item.get("type", "unknown")),
-                "description": item.get("description"),
-            })
+            event = {}
+            for field, primary, fallback, default in _UNLOCK_FIELD_ALIASES:
+                value = item.get(primary)
+                if value is None:
+                    value = item.get(fallback, default)
+                event[field] = value
+            event["description"] = item.get("description")
+            events.append(event)
 
         return {"events": events}
 
@@ -3,6 +3,8 @@ Twitter API v2客户端
 
 提供推特数据和社交情绪分析
 """
+import asyncio
+import functools
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
@@ -10,12 +12,37 @@ from src.core.models import SourceMeta
 from src.data_sources.base import BaseDataSource
 from src.utils.logger import get_logger
 
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    HAS_VADER = True
+except ImportError:
+    HAS_VADER = False
+
 logger = get_logger(__name__)
 
+_vader_analyzer = None
+
+
+def _get_vader_analyzer():
+    """获取VADER情绪分析器单例（词典只加载一次）"""
+    global _vader_analyzer
+    if _vader_analyzer is None:
+        _vader_analyzer = SentimentIntensityAnalyzer()
+    return _vader_analyzer
+
+
+@functools.lru_cache(maxsize=128)
+def _build_crypto_query(symbol: str) -> str:
+    """构建币种情绪查询（使用常见hashtags和cashtags）"""
+    return f"${symbol} OR #{symbol} OR #{symbol}crypto -is:retweet lang:en"
+
 
 class TwitterClient(BaseDataSource):
     """Twitter API v2客户端"""
 
+    # 配额很紧（搜索约450次/15分钟），TTL内的重复查询直接复用进程内响应
+    LOCAL_RESPONSE_CACHE = True
+
     def __init__(self, bearer_token: Optional[str] = None):
         """
         初始化Twitter客户端
@@ -99,14 +126,11 @@ class TwitterClient(BaseDataSource):
         if end_time:
             params["end_time"] = end_time
 
-        raw_data = await self.fetch_raw(endpoint, params)
-
-        meta = SourceMeta(
-            provider="twitter",
+        raw_data, meta = await self.fetch(
             endpoint=endpoint,
-            fetched_at=datetime.utcnow().isoformat() + "Z",
+            params=params,
+            data_type="raw",
             ttl_seconds=300,  # 5分钟缓存
-            cache_hit=False,
         )
 
         # 转换推文数据
@@ -154,14 +178,11 @@ class TwitterClient(BaseDataSource):
         if end_time:
             params["end_time"] = end_time
 
-        raw_data = await self.fetch_raw(endpoint, params)
-
-        meta = SourceMeta(
-            provider="twitter",
+        raw_data, meta = await self.fetch(
             endpoint=endpoint,
-            fetched_at=datetime.utcnow().isoformat() + "Z",
-            ttl_seconds=300,
-            cache_hit=False,
+            params=params,
+            data_type="raw",
+            ttl_seconds=300,  # 5分钟缓存
         )
 
         counts_data = raw_data.get("data", [])
@@ -192,14 +213,11 @@ class TwitterClient(BaseDataSource):
             "user.fields": "created_at,description,public_metrics,verified",
         }
 
-        raw_data = await self.fetch_raw(endpoint, params)
-
-        meta = SourceMeta(
-            provider="twitter",
+        raw_data, meta = await self.fetch(
             endpoint=endpoint,
-            fetched_at=datetime.utcnow().isoformat() + "Z",
+            params=params,
+            data_type="raw",
             ttl_seconds=3600,  # 1小时缓存
-            cache_hit=False,
         )
 
         user = raw_data.get("data", {})
@@ -235,14 +253,11 @@ class TwitterClient(BaseDataSource):
         if end_time:
             params["end_time"] = end_time
 
-        raw_data = await self.fetch_raw(endpoint, params)
-
-        meta = SourceMeta(
-            provider="twitter",
+        raw_data, meta = await self.fetch(
             endpoint=endpoint,
-            fetched_at=datetime.utcnow().isoformat() + "Z",
-            ttl_seconds=300,
-            cache_hit=False,
+            params=params,
+            data_type="raw",
+            ttl_seconds=300,  # 5分钟缓存
         )
 
         tweets = raw_data.get("data", [])
@@ -263,27 +278,32 @@ class TwitterClient(BaseDataSource):
         Returns:
             (情绪分析数据, SourceMeta)
         """
-        # 构建查询（使用常见hashtags和cashtags）
-        query = f"${symbol} OR #{symbol} OR #{symbol}crypto -is:retweet lang:en"
+        query = _build_crypto_query(symbol)
 
-        # 计算时间范围
-        end_time = datetime.utcnow()
-        start_time = end_time - timedelta(hours=hours)
-
-        # 获取推文
-        tweets, meta = await self.search_recent_tweets(
-            query=query,
-            max_results=100,
-            start_time=start_time.isoformat() + "Z",
-            end_time=end_time.isoformat() + "Z",
+        # 计算时间范围：end_time需早于请求时间至少10秒；取整到分钟，使同一分钟内
+        # 的重复调用参数相同，命中进程内响应缓存（LOCAL_RESPONSE_CACHE），数据最多滞后1分钟
+        end_time = (datetime.utcnow() - timedelta(seconds=10)).replace(
+            second=0, microsecond=0
         )
+        start_time = end_time - timedelta(hours=hours)
 
-        # 获取推文数量趋势
-        counts, _ = await self.get_tweet_counts(
-            query=query,
-            start_time=start_time.isoformat() + "Z",
-            end_time=end_time.isoformat() + "Z",
-            granularity="hour",
+        start_iso = start_time.isoformat() + "Z"
+        end_iso = end_time.isoformat() + "Z"
+
+        # 并发获取推文和推文数量趋势（两次请求互不依赖）
+        (tweets, meta), (counts, _) = await asyncio.gather(
+            self.search_recent_tweets(
+                query=query,
+                max_results=100,
+                start_time=start_iso,
+                end_time=end_iso,
+            ),
+            self.get_tweet_counts(
+                query=query,
+                start_time=start_iso,
+                end_time=end_iso,
+                granularity="hour",
+            ),
         )
 
         # 计算情绪指标
@@ -298,7 +318,7 @@ class TwitterClient(BaseDataSource):
             "metrics": sentiment_metrics,
             "top_tweets": tweets[:10],  # 前10条推文
             "hourly_counts": counts.get("counts", []),
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": end_iso,
         }, meta
 
     # ==================== 数据转换方法 ====================
@@ -354,30 +374,46 @@ class TwitterClient(BaseDataSource):
                 "engagement_rate": 0,
                 "verified_ratio": 0,
                 "sentiment_score": 0,
+                "sentiment_method": "vader" if HAS_VADER else "engagement",
             }
 
-        total_likes = sum(t.get("like_count", 0) for t in tweets)
-        total_retweets = sum(t.get("retweet_count", 0) for t in tweets)
-        total_replies = sum(t.get("reply_count", 0) for t in tweets)
+        # 单次遍历累计各项互动指标
+        total_likes = 0
+        total_retweets = 0
+        total_replies = 0
+        verified_count = 0
+        for t in tweets:
+            total_likes += t.get("like_count", 0)
+            total_retweets += t.get("retweet_count", 0)
+            total_replies += t.get("reply_count", 0)
+            if t.get("author", {}).get("verified", False):
+                verified_count += 1
+
+        tweet_count = len(tweets)
         total_engagement = total_likes + total_retweets + total_replies
-
-        verified_count = sum(
-            1 for t in tweets
-            if t.get("author", {}).get("verified", False)
-        )
-
-        # 简单的情绪评分：基于互动率
-        engagement_rate = total_engagement / len(tweets) if tweets else 0
-
-        # 归一化情绪分数（0-100）
-        # 高互动 = 正面情绪（简化假设）
-        sentiment_score = min(100, engagement_rate / 10)
+        engagement_rate = total_engagement / tweet_count
+
+        if HAS_VADER:
+            # 基于推文文本的VADER极性（compound ∈ [-1, 1]）映射到0-100
+            analyzer = _get_vader_analyzer()
+            total_compound = 0.0
+            for t in tweets:
+                text = t.get("text")
+                if text:
+                    total_compound += analyzer.polarity_scores(text)["compound"]
+            sentiment_score = (total_compound / tweet_count + 1) * 50
+            sentiment_method = "vader"
+        else:
+            # 未安装vaderSentiment时回退：基于互动率的简化评分（0-100）
+            sentiment_score = min(100, engagement_rate / 10)
+            sentiment_method = "engagement"
 
         return {
-            "avg_likes": total_likes / len(tweets),
-            "avg_retweets": total_retweets / len(tweets),
-            "avg_replies": total_replies / len(tweets),
+            "avg_likes": total_likes / tweet_count,
+            "avg_retweets": total_retweets / tweet_count,
+            "avg_replies": total_replies / tweet_count,
             "engagement_rate": engagement_rate,
-            "verified_ratio": (verified_count / len(tweets)) * 100,
+            "verified_ratio": (verified_count / tweet_count) * 100,
             "sentiment_score": sentiment_score,
+            "sentiment_method": sentiment_method,
         }
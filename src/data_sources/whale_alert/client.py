@@ -3,12 +3,33 @@ Whale Alert API客户端 - 大额转账监控
 
 API文档: https://docs.whale-alert.io/
 """
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 from src.core.models import SourceMeta, WhaleTransfer, WhaleTransfersData
 from src.data_sources.base import BaseDataSource
 
+# Whale Alert blockchain名称 -> 标准chain名称（未列出的原样返回）
+_BLOCKCHAIN_TO_CHAIN = {
+    "bitcoin": "bitcoin",
+    "ethereum": "ethereum",
+    "tron": "tron",
+    "ripple": "ripple",
+    "neo": "neo",
+    "eos": "eos",
+    "stellar": "stellar",
+    "binancechain": "bsc",
+}
+
+
+def _iso_from_epoch(ts: int) -> str:
+    """Unix秒 -> UTC ISO 8601字符串（不构造datetime对象）"""
+    tm = time.gmtime(ts)
+    return "%04d-%02d-%02dT%02d:%02d:%02dZ" % (
+        tm.tm_year, tm.tm_mon, tm.tm_mday, tm.tm_hour, tm.tm_min, tm.tm_sec
+    )
+
 
 class WhaleAlertClient(BaseDataSource):
     """Whale Alert API客户端"""
@@ -76,11 +97,12 @@ class WhaleAlertClient(BaseDataSource):
         """
         endpoint = "/transactions"
 
-        # 默认查询过去24小时
+        # 每次请求只读取一次时钟，默认查询过去24小时
+        now = datetime.now(timezone.utc)
         if start_time is None:
-            start_time = int((datetime.utcnow() - timedelta(hours=24)).timestamp())
+            start_time = int((now - timedelta(hours=24)).timestamp())
         if end_time is None:
-            end_time = int(datetime.utcnow().timestamp())
+            end_time = int(now.timestamp())
 
         params = {
             "min_value": min_value,
@@ -91,16 +113,37 @@ class WhaleAlertClient(BaseDataSource):
         if currency:
             params["currency"] = currency.lower()
 
+        # 直接从API原始响应构建WhaleTransfer，省去中间dict转换
         data, meta = await self.fetch(
             endpoint=endpoint,
             params=params,
-            data_type="transactions",
+            data_type="raw",
             ttl_seconds=60,  # 1分钟缓存
         )
 
+        transactions = []
+        if data and data.get("result") == "success":
+            transactions = data.get("transactions", [])
+
+        transfers = [
+            WhaleTransfer(
+                tx_hash=t.get("hash", ""),
+                timestamp=_iso_from_epoch(t.get("timestamp", 0)),
+                from_address=t.get("from", {}).get("address", ""),
+                from_label=t.get("from", {}).get("owner", None),
+                to_address=t.get("to", {}).get("address", ""),
+                to_label=t.get("to", {}).get("owner", None),
+                token_symbol=t.get("symbol", "").upper(),
+                amount=t.get("amount", 0),
+                value_usd=t.get("amount_usd", 0),
+                chain=self._blockchain_to_chain(t.get("blockchain", "")),
+                blockchain=t.get("blockchain", ""),
+            )
+            for t in transactions
+        ]
+
         # 计算统计数据
-        transfers = data.get("transfers", [])
-        total_value = sum(t.get("value_usd", 0) for t in transfers)
+        total_value = sum(t.value_usd for t in transfers)
         hours = (end_time - start_time) / 3600
 
         whale_data = WhaleTransfersData(
@@ -110,23 +153,8 @@ class WhaleAlertClient(BaseDataSource):
             min_value_usd=float(min_value),
             total_transfers=len(transfers),
             total_value_usd=total_value,
-            transfers=[
-                WhaleTransfer(
-                    tx_hash=t.get("hash", ""),
-                    timestamp=datetime.fromtimestamp(t.get("timestamp", 0)).isoformat() + "Z",
-                    from_address=t.get("from", {}).get("address", ""),
-                    from_label=t.get("from", {}).get("owner", None),
-                    to_address=t.get("to", {}).get("address", ""),
-                    to_label=t.get("to", {}).get("owner", None),
-                    token_symbol=t.get("symbol", "").upper(),
-                    amount=t.get("amount", 0),
-                    value_usd=t.get("amount_usd", 0),
-                    chain=self._blockchain_to_chain(t.get("blockchain", "")),
-                    blockchain=t.get("blockchain", ""),
-                )
-                for t in transfers
-            ],
-            timestamp=datetime.utcnow().isoformat() + "Z",
+            transfers=transfers,
+            timestamp=now.isoformat().replace("+00:00", "Z"),
         )
 
         return whale_data, meta
@@ -158,17 +186,8 @@ class WhaleAlertClient(BaseDataSource):
 
     def _blockchain_to_chain(self, blockchain: str) -> str:
         """将Whale Alert的blockchain名称转换为标准chain名称"""
-        mapping = {
-            "bitcoin": "bitcoin",
-            "ethereum": "ethereum",
-            "tron": "tron",
-            "ripple": "ripple",
-            "neo": "neo",
-            "eos": "eos",
-            "stellar": "stellar",
-            "binancechain": "bsc",
-        }
-        return mapping.get(blockchain.lower(), blockchain.lower())
+        blockchain = blockchain.lower()
+        return _BLOCKCHAIN_TO_CHAIN.get(blockchain, blockchain)
 
     async def get_status(self) -> tuple[Dict, SourceMeta]:
         """
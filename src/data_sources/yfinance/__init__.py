@@ -7,17 +7,92 @@ Yahoo Finance数据客户端 - 使用yfinance库
 - 外汇（美元指数）
 - 波动率指标（VIX）
 """
-from typing import Any, Dict, List, Tuple
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
 import yfinance as yf
+from yfinance.data import YfData
 
 from src.core.models import SourceMeta
 from src.core.source_meta import SourceMetaBuilder
+from src.middleware.cache import SingleFlight, TTLCache
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+class _TickerPool:
+    """
+    yf.Ticker对象池（按symbol缓存，带TTL）
+
+    yfinance内部已通过单例会话复用HTTP连接；复用Ticker对象可在TTL内
+    复用其已拉取的数据，TTL过期后重建以避免长期持有过期报价。
+    Ticker在线程池中被访问，因此用threading.Lock保护缓存。
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 60.0):
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, ttl: Optional[float] = None) -> yf.Ticker:
+        """
+        获取（或创建）symbol对应的Ticker
+
+        Args:
+            symbol: 符号
+            ttl: 新建Ticker的存活时间，默认使用池的ttl
+        """
+        with self._lock:
+            ticker = self._cache.get(symbol)
+            if ticker is None:
+                ticker = yf.Ticker(symbol)
+                self._cache.set(symbol, ticker, self.ttl if ttl is None else ttl)
+            return ticker
+
+
+_ticker_pool = _TickerPool()
+
+# yfinance 调用均为阻塞IO，放在独立的有界线程池中执行，
+# 既不阻塞事件循环，也不占用默认线程池，并限制对Yahoo的并发数
+_YF_POOL = ThreadPoolExecutor(max_workers=10, thread_name_prefix="yfinance")
+
+
+async def _run_blocking(func, *args) -> Any:
+    """在yfinance专用线程池中执行阻塞调用"""
+    return await asyncio.get_running_loop().run_in_executor(_YF_POOL, func, *args)
+
+
+_US_MARKET_TZ = ZoneInfo("America/New_York")
+_US_MARKET_OPEN = time(9, 30)
+_US_MARKET_CLOSE = time(16, 0)
+
+
+def _seconds_until_us_market_open(now: Optional[datetime] = None) -> int:
+    """
+    距下一次美股开盘的秒数，交易时段内返回0（不考虑节假日）
+
+    休市期间日线及以上K线不会变化，可缓存到下次开盘
+    """
+    now = (now or datetime.now(_US_MARKET_TZ)).astimezone(_US_MARKET_TZ)
+    if now.weekday() < 5 and _US_MARKET_OPEN <= now.time() < _US_MARKET_CLOSE:
+        return 0
+
+    day = now.date()
+    if now.weekday() >= 5 or now.time() >= _US_MARKET_CLOSE:
+        day += timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+
+    next_open = datetime.combine(day, _US_MARKET_OPEN, tzinfo=_US_MARKET_TZ)
+    return int((next_open - now).total_seconds())
+
+
 class YahooFinanceClient:
     """Yahoo Finance客户端 - 基于yfinance库"""
 
@@ -45,28 +120,231 @@ class YahooFinanceClient:
         "eth_usd": "ETH-USD",  # 以太坊
     }
 
+    # 报价缓存TTL（秒），按品种波动频率区分，未列出的符号使用 DEFAULT_QUOTE_TTL
+    DEFAULT_QUOTE_TTL = 300
+    QUOTE_TTL_BY_SYMBOL = {
+        "BTC-USD": 15,
+        "ETH-USD": 15,
+        "^VIX": 30,
+        "^GSPC": 60,
+        "^IXIC": 60,
+        "^DJI": 60,
+        "^RUT": 60,
+        "CL=F": 300,
+        "NG=F": 300,
+        "DX-Y.NYB": 300,
+        "GC=F": 600,
+        "SI=F": 600,
+        "^TNX": 3600,
+        "^TYX": 3600,
+    }
+
+    # Ticker对象最长复用时间（秒），不超过对应报价TTL
+    TICKER_POOL_TTL = 60
+
+    # 进程内报价记忆时间（秒），同一调用链内重复请求同一符号时直接复用
+    QUOTE_MEMO_TTL = 10
+
+    # 休市期间可缓存到下次开盘的K线间隔
+    SESSION_ALIGNED_INTERVALS = {"1d", "1wk", "1mo"}
+    # 按美股交易时段出K线的符号（显式列出）；其他市场的指数/股票（如 ^N225、BP.L）
+    # 以及期货、外汇、加密等近乎24小时交易的品种只按 CHART_TTL_BY_INTERVAL 缓存
+    US_SESSION_SYMBOLS = frozenset(
+        itemgetter(
+            "sp500", "nasdaq", "dow", "russell2000", "vix", "treasury_10y", "treasury_30y"
+        )(COMMON_SYMBOLS)
+    )
+
+    # 直接解析chart接口JSON的日内间隔（30m不在内：yfinance对其有特殊修正）
+    RAW_CHART_INTERVALS = {"1m", "2m", "5m", "15m", "60m", "90m", "1h"}
+    CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart"
+
+    # K线缓存TTL（秒），按interval区分，未列出的interval使用1小时
+    CHART_TTL_BY_INTERVAL = {
+        "1m": 60,
+        "5m": 300,
+        "15m": 900,
+        "1h": 3600,
+        "1d": 21600,  # 6小时
+        "1wk": 86400,  # 1天
+        "1mo": 86400,
+    }
+
+    # 分组输出键 -> COMMON_SYMBOLS键
+    MARKET_INDEX_KEYS = {
+        "sp500": "sp500",
+        "nasdaq": "nasdaq",
+        "dow_jones": "dow",
+        "russell2000": "russell2000",
+        "vix": "vix",
+    }
+    COMMODITY_KEYS = {
+        "gold": "gold",
+        "silver": "silver",
+        "crude_oil": "crude_oil",
+    }
+    CRYPTO_KEYS = {
+        "btc": "btc_usd",
+        "eth": "eth_usd",
+    }
+
+    # 名称/交易所/总股本等静态字段的缓存时间（秒）
+    STATIC_INFO_TTL = 86400
+    # Ticker.info 失败后的负缓存时间（秒），期间报价不再重复请求该重量级接口
+    STATIC_INFO_FAILURE_TTL = 300
+
+    # get_all_indicators 字段表: (价格字段, 涨跌幅字段或None, COMMON_SYMBOLS键)
+    INDICATOR_FIELDS = (
+        ("sp500_price", "sp500_change_pct", "sp500"),
+        ("nasdaq_price", "nasdaq_change_pct", "nasdaq"),
+        ("dow_price", "dow_change_pct", "dow"),
+        ("russell2000_price", "russell2000_change_pct", "russell2000"),
+        ("vix", None, "vix"),
+        ("dxy_value", "dxy_change_pct", "dxy"),
+        ("gold_price", "gold_change_pct", "gold"),
+        ("silver_price", "silver_change_pct", "silver"),
+        ("crude_oil_price", "crude_oil_change_pct", "crude_oil"),
+        ("btc_price", "btc_change_pct", "btc_usd"),
+        ("eth_price", "eth_change_pct", "eth_usd"),
+    )
+
+    # 以上分组表在类定义时解析为实际符号，调用时不再逐个查 COMMON_SYMBOLS
+    # 分组输出键 -> 符号
+    MARKET_INDEX_SYMBOLS = dict(
+        zip(MARKET_INDEX_KEYS, itemgetter(*MARKET_INDEX_KEYS.values())(COMMON_SYMBOLS))
+    )
+    COMMODITY_SYMBOLS = dict(
+        zip(COMMODITY_KEYS, itemgetter(*COMMODITY_KEYS.values())(COMMON_SYMBOLS))
+    )
+    CRYPTO_SYMBOLS = dict(
+        zip(CRYPTO_KEYS, itemgetter(*CRYPTO_KEYS.values())(COMMON_SYMBOLS))
+    )
+    DXY_SYMBOL = COMMON_SYMBOLS["dxy"]
+    # 与 INDICATOR_FIELDS 一一对应
+    INDICATOR_SYMBOLS = itemgetter(*(k for _, _, k in INDICATOR_FIELDS))(COMMON_SYMBOLS)
+
     def __init__(self):
         """初始化Yahoo Finance客户端"""
         self.name = "yfinance"
+        # 报价在线程池中获取，静态信息缓存需加锁
+        self._static_info = TTLCache(maxsize=1024)
+        self._static_info_lock = threading.Lock()
+        # 同一symbol的并发报价请求只发起一次上游调用
+        self._inflight = SingleFlight()
+        # 最近成功的报价（仅在事件循环线程访问），过期时间在写入时确定，命中不续期
+        self._recent_quotes = TTLCache(maxsize=256)
         logger.info("yfinance_client_initialized", library_version=yf.__version__)
 
-    def _transform_ticker_info(self, ticker_data: Dict) -> Dict:
-        """转换yfinance Ticker.info为标准格式"""
+    def quote_ttl(self, *symbols: str) -> int:
+        """报价缓存TTL，多个符号时取最短的"""
+        return min(
+            (self.QUOTE_TTL_BY_SYMBOL.get(s, self.DEFAULT_QUOTE_TTL) for s in symbols),
+            default=self.DEFAULT_QUOTE_TTL,
+        )
+
+    def chart_ttl(self, symbol: str, interval: str) -> int:
+        """K线缓存TTL；美股时段符号的日线及以上在休市期间缓存到下次开盘"""
+        ttl_seconds = self.CHART_TTL_BY_INTERVAL.get(interval, 3600)
+        if interval in self.SESSION_ALIGNED_INTERVALS and symbol in self.US_SESSION_SYMBOLS:
+            ttl_seconds = max(ttl_seconds, _seconds_until_us_market_open())
+        return ttl_seconds
+
+    def _transform_fast_info(
+        self, symbol: str, fast_info: Any, static_info: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """转换yfinance Ticker.fast_info（+每日静态信息）为标准格式"""
+        price = fast_info.last_price
+        previous_close = fast_info.previous_close
+
+        change = change_percent = None
+        if price is not None and previous_close:
+            change = price - previous_close
+            change_percent = change / previous_close * 100
+
+        shares = static_info.get("shares_outstanding")
         return {
-            "symbol": ticker_data.get("symbol"),
-            "name": ticker_data.get("longName") or ticker_data.get("shortName"),
-            "price": ticker_data.get("currentPrice") or ticker_data.get("regularMarketPrice"),
-            "change": ticker_data.get("regularMarketChange"),
-            "change_percent": ticker_data.get("regularMarketChangePercent"),
-            "previous_close": ticker_data.get("previousClose"),
-            "open": ticker_data.get("regularMarketOpen"),
-            "day_high": ticker_data.get("dayHigh"),
-            "day_low": ticker_data.get("dayLow"),
-            "volume": ticker_data.get("volume"),
-            "market_cap": ticker_data.get("marketCap"),
-            "currency": ticker_data.get("currency"),
-            "exchange": ticker_data.get("fullExchangeName"),
+            "symbol": symbol,
+            "name": static_info.get("name"),
+            "price": price,
+            "change": change,
+            "change_percent": change_percent,
+            "previous_close": previous_close,
+            "open": fast_info.open,
+            "day_high": fast_info.day_high,
+            "day_low": fast_info.day_low,
+            "volume": fast_info.last_volume,
+            "market_cap": price * shares if price is not None and shares else None,
+            "currency": fast_info.currency,
+            "exchange": static_info.get("exchange") or fast_info.exchange,
+        }
+
+    def _get_static_info(self, symbol: str, ticker: yf.Ticker) -> Dict[str, Any]:
+        """
+        获取名称、交易所、总股本等日内不变的字段（按symbol缓存一天）
+
+        这些字段只在完整的 Ticker.info 中提供，失败时返回空字典（短时缓存），不影响报价
+        """
+        with self._static_info_lock:
+            cached = self._static_info.get(symbol)
+        if cached is not None:
+            return cached
+
+        try:
+            info = ticker.info or {}
+        except Exception as e:
+            logger.warning("yfinance_static_info_failed", symbol=symbol, error=str(e))
+            with self._static_info_lock:
+                self._static_info.set(symbol, {}, self.STATIC_INFO_FAILURE_TTL)
+            return {}
+
+        static_info = {
+            "name": info.get("longName") or info.get("shortName"),
+            "exchange": info.get("fullExchangeName"),
+            "shares_outstanding": info.get("sharesOutstanding"),
         }
+        with self._static_info_lock:
+            self._static_info.set(symbol, static_info, self.STATIC_INFO_TTL)
+        return static_info
+
+    def _fetch_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        同步获取单个符号的报价（阻塞调用，需在线程中执行）
+
+        行情字段取自 fast_info（K线接口），不再每次拉取完整的 quoteSummary
+
+        Returns:
+            标准化报价，无数据返回None
+        """
+        # fast_info 的数据缓存在Ticker上，Ticker复用时间不能超过报价TTL
+        ticker = _ticker_pool.get(
+            symbol, min(self.quote_ttl(symbol), self.TICKER_POOL_TTL)
+        )
+        fast_info = ticker.fast_info
+        if fast_info.last_price is None:
+            return None
+        return self._transform_fast_info(
+            symbol, fast_info, self._get_static_info(symbol, ticker)
+        )
+
+    async def _fetch_info_async(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        在线程中获取报价
+
+        QUOTE_MEMO_TTL 内的重复请求直接返回最近一次成功结果，
+        并发的同symbol请求合并为一次；失败和空结果不记忆
+        """
+        quote = self._recent_quotes.get(symbol)
+        if quote is None:
+            quote = await self._inflight.do(
+                symbol, lambda: _run_blocking(self._fetch_info, symbol)
+            )
+            if quote is None:
+                return None
+            self._recent_quotes.set(
+                symbol, quote, min(self.quote_ttl(symbol), self.QUOTE_MEMO_TTL)
+            )
+        # 返回副本，调用方修改不影响记忆的报价
+        return dict(quote)
 
     async def get_quote(self, symbol: str) -> Tuple[Dict[str, Any], SourceMeta]:
         """
@@ -79,17 +357,15 @@ class YahooFinanceClient:
             (报价数据, SourceMeta)
         """
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            data = await self._fetch_info_async(symbol)
 
-            if not info or not info.get("symbol"):
+            if data is None:
                 raise ValueError(f"No data returned for symbol: {symbol}")
 
-            data = self._transform_ticker_info(info)
             meta = SourceMetaBuilder.build(
                 provider=self.name,
                 endpoint=f"Ticker({symbol})",
-                ttl_seconds=300,
+                ttl_seconds=self.quote_ttl(symbol),
             )
 
             return data, meta
@@ -101,7 +377,7 @@ class YahooFinanceClient:
         self, symbols: List[str]
     ) -> Tuple[Dict[str, Any], SourceMeta]:
         """
-        批量获取报价
+        批量获取报价（各符号并发请求）
 
         Args:
             symbols: 符号列表
@@ -109,28 +385,107 @@ class YahooFinanceClient:
         Returns:
             (多个报价, SourceMeta)
         """
-        quotes = {}
+        results = await asyncio.gather(
+            *[self._fetch_info_async(symbol) for symbol in symbols],
+            return_exceptions=True,
+        )
 
-        for symbol in symbols:
-            try:
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
-                if info and info.get("symbol"):
-                    quotes[symbol] = self._transform_ticker_info(info)
-                else:
-                    quotes[symbol] = None
-            except Exception as e:
-                logger.warning("yfinance_ticker_failed", symbol=symbol, error=str(e))
+        quotes = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.warning("yfinance_ticker_failed", symbol=symbol, error=str(result))
                 quotes[symbol] = None
+            else:
+                quotes[symbol] = result
 
         meta = SourceMetaBuilder.build(
             provider=self.name,
             endpoint=f"Tickers({len(symbols)})",
-            ttl_seconds=300,
+            ttl_seconds=self.quote_ttl(*symbols),
         )
 
         return quotes, meta
 
+    def _fetch_history_candles(
+        self, symbol: str, interval: str, period: str
+    ) -> List[Dict[str, Any]]:
+        """通过 Ticker.history() 获取K线（阻塞调用，需在线程中执行）"""
+        hist = _ticker_pool.get(symbol).history(period=period, interval=interval)
+        if hist.empty:
+            return []
+
+        # 按列整体转换，避免 iterrows() 逐行构造 Series
+        index = hist.index
+        timestamps = index.as_unit("s").asi8.tolist()
+        datetimes = [ts.isoformat() for ts in index]
+        return [
+            {
+                "timestamp": ts,
+                "datetime": dt,
+                "open": o,
+                "high": h,
+                "low": low,
+                "close": c,
+                "volume": v,
+            }
+            for ts, dt, o, h, low, c, v in zip(
+                timestamps,
+                datetimes,
+                hist["Open"].tolist(),
+                hist["High"].tolist(),
+                hist["Low"].tolist(),
+                hist["Close"].tolist(),
+                hist["Volume"].tolist(),
+            )
+        ]
+
+    def _fetch_raw_chart_candles(
+        self, symbol: str, interval: str, period: str
+    ) -> List[Dict[str, Any]]:
+        """
+        直接请求 v8 chart 接口并解析JSON（阻塞调用，需在线程中执行）
+
+        复用yfinance的会话（cookie/crumb与浏览器指纹），跳过DataFrame构建；
+        仅用于日内间隔，这些间隔没有复权处理
+        """
+        data = YfData().get_raw_json(
+            f"{self.CHART_URL}/{symbol}",
+            params={"range": period, "interval": interval, "includePrePost": "false"},
+        )
+        chart = data.get("chart") or {}
+        if chart.get("error"):
+            raise ValueError(f"Yahoo chart error for {symbol}: {chart['error']}")
+
+        results = chart.get("result") or []
+        if not results:
+            return []
+        result = results[0]
+        timestamps = result.get("timestamp") or []
+        quote = ((result.get("indicators") or {}).get("quote") or [{}])[0]
+        tz = ZoneInfo(result.get("meta", {}).get("exchangeTimezoneName") or "UTC")
+
+        # 与 history() 一致：丢弃无成交的空K线
+        return [
+            {
+                "timestamp": ts,
+                "datetime": datetime.fromtimestamp(ts, tz).isoformat(),
+                "open": o,
+                "high": h,
+                "low": low,
+                "close": c,
+                "volume": v or 0,
+            }
+            for ts, o, h, low, c, v in zip(
+                timestamps,
+                quote.get("open", []),
+                quote.get("high", []),
+                quote.get("low", []),
+                quote.get("close", []),
+                quote.get("volume", []),
+            )
+            if c is not None
+        ]
+
     async def get_chart(
         self,
         symbol: str,
@@ -149,46 +504,26 @@ class YahooFinanceClient:
             (K线数据, SourceMeta)
         """
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=period, interval=interval)
+            # 日内K线直接解析chart接口JSON，其余间隔仍走 history()（含复权等处理）
+            if interval in self.RAW_CHART_INTERVALS:
+                fetch, endpoint = self._fetch_raw_chart_candles, f"chart({symbol})"
+            else:
+                fetch, endpoint = self._fetch_history_candles, f"history({symbol})"
+            candles = await _run_blocking(fetch, symbol, interval, period)
 
-            if hist.empty:
+            if not candles:
                 raise ValueError(f"No chart data for {symbol}")
 
-            candles = []
-            for index, row in hist.iterrows():
-                candles.append({
-                    "timestamp": int(index.timestamp()),
-                    "datetime": index.isoformat(),
-                    "open": row["Open"],
-                    "high": row["High"],
-                    "low": row["Low"],
-                    "close": row["Close"],
-                    "volume": row["Volume"],
-                })
-
             result = {
                 "symbol": symbol,
                 "candles": candles,
                 "count": len(candles),
             }
 
-            # 根据interval调整TTL
-            ttl_map = {
-                "1m": 60,
-                "5m": 300,
-                "15m": 900,
-                "1h": 3600,
-                "1d": 21600,  # 6小时
-                "1wk": 86400,  # 1天
-                "1mo": 86400,
-            }
-            ttl_seconds = ttl_map.get(interval, 3600)
-
             meta = SourceMetaBuilder.build(
                 provider=self.name,
-                endpoint=f"history({symbol})",
-                ttl_seconds=ttl_seconds,
+                endpoint=endpoint,
+                ttl_seconds=self.chart_ttl(symbol, interval),
             )
 
             return result, meta
@@ -196,6 +531,12 @@ class YahooFinanceClient:
             logger.error("yfinance_get_chart_failed", symbol=symbol, error=str(e))
             raise
 
+    def _select_quotes(
+        self, quotes: Dict[str, Any], symbols: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """按分组表（输出键 -> 符号）从批量报价中取出对应结果"""
+        return {out_key: quotes.get(symbol) for out_key, symbol in symbols.items()}
+
     async def get_market_indices(self) -> Tuple[Dict[str, Any], SourceMeta]:
         """
         获取主要市场指数
@@ -203,23 +544,10 @@ class YahooFinanceClient:
         Returns:
             (市场指数数据, SourceMeta)
         """
-        symbols = [
-            self.COMMON_SYMBOLS["sp500"],
-            self.COMMON_SYMBOLS["nasdaq"],
-            self.COMMON_SYMBOLS["dow"],
-            self.COMMON_SYMBOLS["russell2000"],
-            self.COMMON_SYMBOLS["vix"],
-        ]
-
-        quotes, meta = await self.get_multiple_quotes(symbols)
-
-        return {
-            "sp500": quotes.get(self.COMMON_SYMBOLS["sp500"]),
-            "nasdaq": quotes.get(self.COMMON_SYMBOLS["nasdaq"]),
-            "dow_jones": quotes.get(self.COMMON_SYMBOLS["dow"]),
-            "russell2000": quotes.get(self.COMMON_SYMBOLS["russell2000"]),
-            "vix": quotes.get(self.COMMON_SYMBOLS["vix"]),
-        }, meta
+        quotes, meta = await self.get_multiple_quotes(
+            list(self.MARKET_INDEX_SYMBOLS.values())
+        )
+        return self._select_quotes(quotes, self.MARKET_INDEX_SYMBOLS), meta
 
     async def get_commodities(self) -> Tuple[Dict[str, Any], SourceMeta]:
         """
@@ -228,18 +556,34 @@ class YahooFinanceClient:
         Returns:
             (大宗商品数据, SourceMeta)
         """
-        symbols = [
-            self.COMMON_SYMBOLS["gold"],
-            self.COMMON_SYMBOLS["silver"],
-            self.COMMON_SYMBOLS["crude_oil"],
-        ]
+        quotes, meta = await self.get_multiple_quotes(
+            list(self.COMMODITY_SYMBOLS.values())
+        )
+        return self._select_quotes(quotes, self.COMMODITY_SYMBOLS), meta
 
-        quotes, meta = await self.get_multiple_quotes(symbols)
+    async def get_market_snapshot(self) -> Tuple[Dict[str, Any], SourceMeta]:
+        """
+        一次批量请求获取股指、大宗商品、美元指数和BTC/ETH
+
+        需要多组数据的调用方应使用此方法，避免分别调用
+        get_market_indices / get_commodities / get_dollar_index / get_quote 产生多次往返
+
+        Returns:
+            ({"indices": {...}, "commodities": {...}, "dollar_index": {...},
+              "crypto": {...}}, SourceMeta)
+        """
+        quotes, meta = await self.get_multiple_quotes([
+            *self.MARKET_INDEX_SYMBOLS.values(),
+            *self.COMMODITY_SYMBOLS.values(),
+            self.DXY_SYMBOL,
+            *self.CRYPTO_SYMBOLS.values(),
+        ])
 
         return {
-            "gold": quotes.get(self.COMMON_SYMBOLS["gold"]),
-            "silver": quotes.get(self.COMMON_SYMBOLS["silver"]),
-            "crude_oil": quotes.get(self.COMMON_SYMBOLS["crude_oil"]),
+            "indices": self._select_quotes(quotes, self.MARKET_INDEX_SYMBOLS),
+            "commodities": self._select_quotes(quotes, self.COMMODITY_SYMBOLS),
+            "dollar_index": quotes.get(self.DXY_SYMBOL),
+            "crypto": self._select_quotes(quotes, self.CRYPTO_SYMBOLS),
         }, meta
 
     async def get_dollar_index(self) -> Tuple[Dict[str, Any], SourceMeta]:
@@ -249,7 +593,7 @@ class YahooFinanceClient:
         Returns:
             (美元指数数据, SourceMeta)
         """
-        return await self.get_quote(self.COMMON_SYMBOLS["dxy"])
+        return await self.get_quote(self.DXY_SYMBOL)
 
     async def calculate_market_breadth(
         self,
@@ -306,119 +650,22 @@ class YahooFinanceClient:
             - 商品: gold_price, silver_price, crude_oil_price + 涨跌幅
             - 加密: btc_price, eth_price + 涨跌幅
         """
-        result = {}
-
-        # === 股指（价格 + 涨跌幅） ===
-        try:
-            sp500_data, meta = await self.get_quote(self.COMMON_SYMBOLS["sp500"])
-            if sp500_data:
-                result["sp500_price"] = sp500_data.get("price")
-                result["sp500_change_pct"] = sp500_data.get("change_percent")
-            else:
-                result["sp500_price"] = None
-                result["sp500_change_pct"] = None
-
-            nasdaq_data, _ = await self.get_quote(self.COMMON_SYMBOLS["nasdaq"])
-            if nasdaq_data:
-                result["nasdaq_price"] = nasdaq_data.get("price")
-                result["nasdaq_change_pct"] = nasdaq_data.get("change_percent")
-            else:
-                result["nasdaq_price"] = None
-                result["nasdaq_change_pct"] = None
-
-            dow_data, _ = await self.get_quote(self.COMMON_SYMBOLS["dow"])
-            if dow_data:
-                result["dow_price"] = dow_data.get("price")
-                result["dow_change_pct"] = dow_data.get("change_percent")
-            else:
-                result["dow_price"] = None
-                result["dow_change_pct"] = None
-
-            russell2000_data, _ = await self.get_quote(self.COMMON_SYMBOLS["russell2000"])
-            if russell2000_data:
-                result["russell2000_price"] = russell2000_data.get("price")
-                result["russell2000_change_pct"] = russell2000_data.get("change_percent")
-            else:
-                result["russell2000_price"] = None
-                result["russell2000_change_pct"] = None
-
-        except Exception as e:
-            logger.error("yfinance_stock_indices_failed", error=str(e))
-
-        # === 波动率 ===
-        try:
-            vix_data, _ = await self.get_quote(self.COMMON_SYMBOLS["vix"])
-            result["vix"] = vix_data.get("price") if vix_data else None
-        except Exception as e:
-            logger.error("yfinance_vix_failed", error=str(e))
+        symbols = self.INDICATOR_SYMBOLS
 
-        # === 美元指数 ===
-        try:
-            dxy_data, _ = await self.get_quote(self.COMMON_SYMBOLS["dxy"])
-            if dxy_data:
-                result["dxy_value"] = dxy_data.get("price")
-                result["dxy_change_pct"] = dxy_data.get("change_percent")
-            else:
-                result["dxy_value"] = None
-                result["dxy_change_pct"] = None
-        except Exception as e:
-            logger.error("yfinance_dxy_failed", error=str(e))
+        # 所有符号一次并发批量获取，再按字段表映射
+        quotes, _ = await self.get_multiple_quotes(list(symbols))
 
-        # === 大宗商品 ===
-        try:
-            gold_data, _ = await self.get_quote(self.COMMON_SYMBOLS["gold"])
-            if gold_data:
-                result["gold_price"] = gold_data.get("price")
-                result["gold_change_pct"] = gold_data.get("change_percent")
-            else:
-                result["gold_price"] = None
-                result["gold_change_pct"] = None
-
-            silver_data, _ = await self.get_quote(self.COMMON_SYMBOLS["silver"])
-            if silver_data:
-                result["silver_price"] = silver_data.get("price")
-                result["silver_change_pct"] = silver_data.get("change_percent")
-            else:
-                result["silver_price"] = None
-                result["silver_change_pct"] = None
-
-            crude_oil_data, _ = await self.get_quote(self.COMMON_SYMBOLS["crude_oil"])
-            if crude_oil_data:
-                result["crude_oil_price"] = crude_oil_data.get("price")
-                result["crude_oil_change_pct"] = crude_oil_data.get("change_percent")
-            else:
-                result["crude_oil_price"] = None
-                result["crude_oil_change_pct"] = None
-
-        except Exception as e:
-            logger.error("yfinance_commodities_failed", error=str(e))
-
-        # === 加密货币（通过 YFinance） ===
-        try:
-            btc_data, _ = await self.get_quote(self.COMMON_SYMBOLS["btc_usd"])
-            if btc_data:
-                result["btc_price"] = btc_data.get("price")
-                result["btc_change_pct"] = btc_data.get("change_percent")
-            else:
-                result["btc_price"] = None
-                result["btc_change_pct"] = None
-
-            eth_data, _ = await self.get_quote(self.COMMON_SYMBOLS["eth_usd"])
-            if eth_data:
-                result["eth_price"] = eth_data.get("price")
-                result["eth_change_pct"] = eth_data.get("change_percent")
-            else:
-                result["eth_price"] = None
-                result["eth_change_pct"] = None
-
-        except Exception as e:
-            logger.error("yfinance_crypto_failed", error=str(e))
+        result = {}
+        for (price_key, change_key, _), symbol in zip(self.INDICATOR_FIELDS, symbols):
+            quote = quotes.get(symbol) or {}
+            result[price_key] = quote.get("price")
+            if change_key:
+                result[change_key] = quote.get("change_percent")
 
-        # 使用最后一个有效的 meta（或构建新的）
         meta = SourceMetaBuilder.build(
             provider=self.name,
             endpoint="get_all_indicators()",
-            ttl_seconds=300,
+            ttl_seconds=self.quote_ttl(*symbols),
         )
 
         return result, meta
@@ -1,11 +1,34 @@
 """
 Redis缓存管理器
 """
+import asyncio
+import fnmatch
 import hashlib
 import json
-from typing import Any, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
 
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
 
 from src.utils.config import config
 from src.utils.exceptions import CacheError
@@ -14,9 +37,188 @@ from src.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _hash_params(params: dict) -> str:
+    """
+    计算参数字典的稳定哈希（64位，16个十六进制字符）
+
+    键排序后序列化保证同一组参数得到同一哈希；
+    安装了 orjson/xxhash 时走C实现，否则回退到 json + md5
+    """
+    if HAS_ORJSON:
+        payload = orjson.dumps(
+            params,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+    else:
+        payload = json.dumps(params, sort_keys=True, default=str).encode()
+
+    if HAS_XXHASH:
+        return xxhash.xxh3_64_hexdigest(payload)
+    return hashlib.md5(payload).hexdigest()[:16]
+
+
+# msgpack格式缓存值的前缀，用于与JSON格式（旧数据/未安装msgpack）区分
+_MSGPACK_MAGIC = b"\x01mp"
+
+
+def _dumps(value: Any) -> bytes:
+    """
+    序列化缓存值
+
+    优先msgpack（带格式前缀，数值密集的K线数据体积约为JSON的一半以下），
+    其次orjson，最后json
+    """
+    if HAS_MSGPACK:
+        try:
+            return _MSGPACK_MAGIC + msgpack.packb(value, default=str, use_bin_type=True)
+        except (TypeError, ValueError, OverflowError):
+            # 如超过64位的整数，msgpack不支持
+            pass
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(value, default=str).encode()
+
+
+def _loads(data: bytes | str) -> Any:
+    """反序列化缓存值（按前缀识别msgpack，否则按JSON解析）"""
+    if isinstance(data, bytes) and data.startswith(_MSGPACK_MAGIC):
+        if not HAS_MSGPACK:
+            raise CacheError("Cached value is msgpack-encoded but msgpack is not installed")
+        return msgpack.unpackb(
+            data[len(_MSGPACK_MAGIC):], raw=False, strict_map_key=False
+        )
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class TTLCache:
+    """进程内LRU+TTL缓存（每个条目独立过期时间）"""
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        初始化缓存
+
+        Args:
+            maxsize: 最大条目数，超出时淘汰最久未使用的条目
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        获取未过期的缓存值
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存值，不存在或已过期返回None
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        设置缓存值
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 过期时间（秒），<=0 时不缓存
+        """
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """删除缓存条目（不存在时忽略）"""
+        self._data.pop(key, None)
+
+    def keys(self) -> list[Hashable]:
+        """当前所有键的快照（含未清理的过期条目）"""
+        return list(self._data)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight:
+    """
+    合并同一键的并发请求（singleflight）
+
+    同一键同时只有一个协程真正执行，其余协程等待同一结果；
+    执行体作为独立任务运行，发起者被取消不会影响其他等待者。
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行（或加入正在执行的）请求
+
+        Args:
+            key: 去重键
+            func: 无参协程工厂，仅在没有进行中的同键请求时调用
+
+        Returns:
+            func 的返回值（并发调用方共享同一对象）
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 所有等待者都已取消时，避免 "exception was never retrieved" 警告
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
 class CacheManager:
     """Redis缓存管理器"""
 
+    # invalidate_pattern 每次SCAN/DEL的键数量
+    SCAN_BATCH_SIZE = 500
+    # 进程内L1缓存：容量与最长TTL（实际TTL取 min(Redis剩余TTL, L1_MAX_TTL)）
+    L1_MAXSIZE = 10_000
+    L1_MAX_TTL = 30
+    # Redis服务端辅助失效（CLIENT TRACKING）的通知频道（RESP2重定向模式）
+    INVALIDATION_CHANNEL = "__redis__:invalidate"
+    # 失效监听连接空闲探活间隔，以及断线重新订阅的退避区间（秒）
+    INVALIDATION_PING_INTERVAL = 30.0
+    INVALIDATION_RECONNECT_DELAY = 1.0
+    INVALIDATION_RECONNECT_MAX_DELAY = 30.0
+
     def __init__(self, redis_url: Optional[str] = None):
         """
         初始化缓存管理器
@@ -26,38 +228,157 @@ class CacheManager:
         """
         self.redis_url = redis_url or config.settings.redis_url
         self._redis: Optional[Redis] = None
+        self._init_lock = asyncio.Lock()
+        # L1 存放序列化后的字节，命中时反序列化出新对象，避免调用方修改共享缓存
+        self._l1 = TTLCache(maxsize=self.L1_MAXSIZE)
+        self._invalidation_task: Optional[asyncio.Task] = None
 
     async def _get_redis(self) -> Redis:
-        """获取Redis连接（懒加载）"""
-        if self._redis is None:
-            try:
-                self._redis = Redis.from_url(
-                    self.redis_url,
-                    max_connections=config.settings.redis_max_connections,
-                    decode_responses=True,
-                )
-                # 测试连接
-                await self._redis.ping()
+        """获取Redis连接（懒加载，并发首次调用只建立一个客户端）"""
+        if self._redis is not None:
+            return self._redis
+
+        async with self._init_lock:
+            if self._redis is None:
+                try:
+                    redis = Redis.from_url(
+                        self.redis_url,
+                        max_connections=config.settings.redis_max_connections,
+                        # 缓存值可能是msgpack二进制，不做UTF-8解码
+                        decode_responses=False,
+                        health_check_interval=30,
+                    )
+                    # 测试连接，成功后才对外可见，失败时下次调用会重试
+                    try:
+                        await redis.ping()
+                    except Exception:
+                        await redis.aclose()
+                        raise
+                except Exception as e:
+                    logger.error("Failed to connect to Redis", error=str(e))
+                    raise CacheError(f"Redis connection failed: {e}")
+
+                self._redis = redis
                 logger.info("Redis connection established", url=self.redis_url)
-            except Exception as e:
-                logger.error("Failed to connect to Redis", error=str(e))
-                raise CacheError(f"Redis connection failed: {e}")
+                self._invalidation_task = asyncio.create_task(
+                    self._listen_invalidations()
+                )
         return self._redis
 
+    async def connect(self) -> bool:
+        """
+        预先建立Redis连接（启动时调用，避免首个请求承担连接开销）
+
+        Returns:
+            是否连接成功；失败时缓存操作降级为未命中，不影响启动
+        """
+        try:
+            await self._get_redis()
+            return True
+        except CacheError:
+            return False
+
     async def close(self):
         """关闭Redis连接"""
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+            self._invalidation_task = None
+        self._l1.clear()
         if self._redis:
             await self._redis.aclose()
             self._redis = None
             logger.info("Redis connection closed")
 
+    def _l1_set(self, key: str, serialized: bytes, ttl: Optional[float]) -> None:
+        """写入L1，TTL不超过 L1_MAX_TTL"""
+        self._l1.set(key, serialized, min(ttl, self.L1_MAX_TTL) if ttl else self.L1_MAX_TTL)
+
+    def _l1_evict(self, pattern: str) -> None:
+        """按键或glob模式清除L1条目"""
+        if any(c in pattern for c in "*?["):
+            for key in self._l1.keys():
+                if fnmatch.fnmatchcase(key, pattern):
+                    self._l1.pop(key)
+        else:
+            self._l1.pop(pattern)
+
+    def _new_tracking_connection(self):
+        """创建不属于连接池的独立连接（订阅态连接不能归还连接池复用）"""
+        pool = self._redis.connection_pool
+        # 订阅态下PING的回复是列表，关闭发送命令前的自动健康检查，改为空闲时主动PING
+        kwargs = {**pool.connection_kwargs, "health_check_interval": 0}
+        return pool.connection_class(**kwargs)
+
+    async def _listen_invalidations(self) -> None:
+        """
+        通过 CLIENT TRACKING 接收Redis的键失效通知，清除本进程L1中对应条目
+
+        使用连接池之外的独立连接：开启BCAST模式跟踪并重定向到自身（NOLOOP，
+        不接收本连接自身修改的通知），再订阅 __redis__:invalidate。任何客户端
+        （包括其他进程）修改或删除键、键过期或被淘汰时，Redis都会推送键名，
+        无需应用层发布消息。连接断开期间可能错过通知，因此断开后清空L1并按
+        指数退避重新订阅。需要 Redis 6+；服务端不支持时L1仅按TTL过期。
+        """
+        delay = self.INVALIDATION_RECONNECT_DELAY
+        while True:
+            conn = self._new_tracking_connection()
+            try:
+                await conn.connect()
+                await conn.send_command("CLIENT", "ID")
+                client_id = await conn.read_response()
+                await conn.send_command(
+                    "CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST", "NOLOOP"
+                )
+                await conn.read_response()
+                await conn.send_command("SUBSCRIBE", self.INVALIDATION_CHANNEL)
+                await conn.read_response()
+                logger.info("Cache invalidation tracking enabled", client_id=client_id)
+                delay = self.INVALIDATION_RECONNECT_DELAY
+
+                while True:
+                    message = await conn.read_response(
+                        timeout=self.INVALIDATION_PING_INTERVAL
+                    )
+                    if message is None:
+                        # 空闲探活，半开连接会在发送或下次读取时报错
+                        await conn.send_command("PING")
+                        continue
+                    if not isinstance(message, list) or message[0] != b"message":
+                        continue
+                    keys = message[2]
+                    if keys is None:
+                        # FLUSHDB/FLUSHALL
+                        self._l1.clear()
+                    else:
+                        for key in keys:
+                            self._l1.pop(key.decode())
+            except asyncio.CancelledError:
+                raise
+            except ResponseError as e:
+                # 服务端不支持CLIENT TRACKING，L1仅按TTL过期
+                logger.warning("Cache invalidation tracking unavailable", error=str(e))
+                return
+            except Exception as e:
+                logger.warning(
+                    "Cache invalidation connection lost, resubscribing",
+                    error=str(e),
+                    retry_in=delay,
+                )
+            finally:
+                await conn.disconnect()
+
+            # 断开期间的失效通知已丢失，L1中的条目可能已过时
+            self._l1.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.INVALIDATION_RECONNECT_MAX_DELAY)
+
     @staticmethod
     def build_cache_key(tool_name: str, capability: str, params: dict) -> str:
         """
         构建缓存键
 
         格式: tool_name:capability:symbol:params_hash
-        例如: crypto_overview:market:BTC:a1b2c3d4
+        例如: crypto_overview:market:BTC:a1b2c3d4e5f60718
 
         Args:
             tool_name: 工具名称
@@ -71,8 +392,7 @@ class CacheManager:
         symbol = params.get("symbol", "")
 
         # 生成参数hash
-        params_str = json.dumps(params, sort_keys=True, default=str)
-        params_hash = hashlib.md5(params_str.encode()).hexdigest()[:8]
+        params_hash = _hash_params(params)
 
         if symbol:
             return f"{tool_name}:{capability}:{symbol.upper()}:{params_hash}"
@@ -92,13 +412,23 @@ class CacheManager:
         if not config.settings.enable_cache:
             return None
 
+        data = self._l1.get(key)
+        if data is not None:
+            logger.debug("Cache hit", key=key, layer="l1")
+            return _loads(data)
+
         try:
             redis = await self._get_redis()
-            data = await redis.get(key)
+            pipe = redis.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.ttl(key)
+            data, ttl = await pipe.execute()
 
             if data:
                 logger.debug("Cache hit", key=key)
-                return json.loads(data)
+                # ttl == -1 表示永不过期
+                self._l1_set(key, data, ttl if ttl > 0 else None)
+                return _loads(data)
             else:
                 logger.debug("Cache miss", key=key)
                 return None
@@ -129,12 +459,13 @@ class CacheManager:
 
         try:
             redis = await self._get_redis()
-            serialized = json.dumps(value, default=str)
+            serialized = _dumps(value)
 
             if ttl:
                 await redis.setex(key, ttl, serialized)
             else:
                 await redis.set(key, serialized)
+            self._l1_set(key, serialized, ttl)
 
             logger.debug("Cache set", key=key, ttl=ttl)
             return True
@@ -153,6 +484,7 @@ class CacheManager:
         Returns:
             是否成功删除
         """
+        self._l1.pop(key)
         try:
             redis = await self._get_redis()
             result = await redis.delete(key)
@@ -173,16 +505,31 @@ class CacheManager:
         Returns:
             删除的键数量
         """
+        self._l1_evict(pattern)
         try:
             redis = await self._get_redis()
-            keys = await redis.keys(pattern)
 
-            if keys:
-                deleted = await redis.delete(*keys)
-                logger.info("Cache invalidated", pattern=pattern, count=deleted)
-                return deleted
+            # SCAN游标遍历代替KEYS，避免大库上阻塞Redis；按批删除
+            deleted = 0
+            batch: list[str] = []
+            cursor = 0
+            while True:
+                cursor, keys = await redis.scan(
+                    cursor=cursor, match=pattern, count=self.SCAN_BATCH_SIZE
+                )
+                batch.extend(keys)
+                if len(batch) >= self.SCAN_BATCH_SIZE:
+                    deleted += await redis.delete(*batch)
+                    batch.clear()
+                if cursor == 0:
+                    break
 
-            return 0
+            if batch:
+                deleted += await redis.delete(*batch)
+
+            if deleted:
+                logger.info("Cache invalidated", pattern=pattern, count=deleted)
+            return deleted
 
         except Exception as e:
             logger.warning("Cache invalidation failed", pattern=pattern, error=str(e))
@@ -238,6 +585,7 @@ class CacheManager:
             是否成功
         """
         try:
+            self._l1.clear()
             redis = await self._get_redis()
             await redis.flushdb()
             logger.warning("All cache cleared (FLUSHDB)")
@@ -7,11 +7,13 @@
 - 错误聚合和监控
 """
 import asyncio
+import random
 import time
-from datetime import datetime, timedelta
+from collections import Counter, deque
+from datetime import datetime
 from enum import Enum
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Type
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
 
 import structlog
 
@@ -33,6 +35,11 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"  # 半开状态，允许少量请求测试
 
 
+def _format_wall_time(ts: Optional[float]) -> Optional[str]:
+    """把 time.time() 时间戳格式化为本地时间ISO字符串"""
+    return datetime.fromtimestamp(ts).isoformat() if ts is not None else None
+
+
 class CircuitBreaker:
     """
     断路器模式实现
@@ -40,12 +47,30 @@ class CircuitBreaker:
     当错误率超过阈值时，暂时停止请求，避免雪崩效应
     """
 
+    __slots__ = (
+        "name",
+        "failure_threshold",
+        "recovery_timeout",
+        "expected_exception",
+        "half_open_success_threshold",
+        "half_open_max_concurrent",
+        "_state_raw",
+        "_failure_count",
+        "_half_open_successes",
+        "_half_open_inflight",
+        "_last_failure_monotonic",
+        "_last_failure_time",
+        "_last_success_time",
+    )
+
     def __init__(
         self,
         name: str,
         failure_threshold: int = 5,  # 失败次数阈值
         recovery_timeout: float = 60.0,  # 恢复超时（秒）
         expected_exception: Type[Exception] = Exception,
+        half_open_success_threshold: int = 1,
+        half_open_max_concurrent: Optional[int] = None,
     ):
         """
         初始化断路器
@@ -55,16 +80,27 @@ class CircuitBreaker:
             failure_threshold: 连续失败次数阈值
             recovery_timeout: 断开后多久尝试恢复（秒）
             expected_exception: 需要捕获的异常类型
+            half_open_success_threshold: HALF_OPEN 状态下连续成功多少次才关闭断路器，
+                避免上游间歇恢复时一次侥幸成功就关闭导致状态抖动
+            half_open_max_concurrent: HALF_OPEN 状态下允许同时进行的探测请求数，
+                超出的请求直接拒绝（None 表示不限制）
         """
         self.name = name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.expected_exception = expected_exception
+        self.half_open_success_threshold = max(1, half_open_success_threshold)
+        self.half_open_max_concurrent = half_open_max_concurrent
 
-        self._state = CircuitState.CLOSED
+        self._state_raw = CircuitState.CLOSED
         self._failure_count = 0
-        self._last_failure_time: Optional[datetime] = None
-        self._last_success_time: Optional[datetime] = None
+        self._half_open_successes = 0
+        self._half_open_inflight = 0
+        # 单调时钟用于恢复计时（不受系统时间跳变影响），
+        # 墙钟时间戳（time.time()）仅用于 get_stats 展示
+        self._last_failure_monotonic: Optional[float] = None
+        self._last_failure_time: Optional[float] = None
+        self._last_success_time: Optional[float] = None
 
         logger.info(
             "circuit_breaker_initialized",
@@ -76,39 +112,37 @@ class CircuitBreaker:
     @property
     def state(self) -> CircuitState:
         """获取当前状态（考虑自动恢复）"""
-        if self._state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                logger.info(
-                    "circuit_breaker_half_open",
-                    name=self.name,
-                    reason="recovery_timeout_elapsed",
-                )
-                self._state = CircuitState.HALF_OPEN
-        return self._state
+        state = self._state_raw
+        # CLOSED 是绝大多数情况，只需一次属性读取和一次比较
+        if state is CircuitState.OPEN and self._should_attempt_reset():
+            logger.info(
+                "circuit_breaker_half_open",
+                name=self.name,
+                reason="recovery_timeout_elapsed",
+            )
+            state = self._state_raw = CircuitState.HALF_OPEN
+        return state
 
     def _should_attempt_reset(self) -> bool:
         """是否应该尝试重置（从OPEN到HALF_OPEN）"""
-        if not self._last_failure_time:
+        if self._last_failure_monotonic is None:
             return False
-        elapsed = (datetime.now() - self._last_failure_time).total_seconds()
+        elapsed = time.monotonic() - self._last_failure_monotonic
         return elapsed >= self.recovery_timeout
 
-    async def call(self, func: Callable, *args, **kwargs) -> Any:
+    def _check_open(self) -> bool:
         """
-        通过断路器调用函数
-
-        Args:
-            func: 要调用的函数
-            *args: 函数参数
-            **kwargs: 函数关键字参数
+        断路器开启时拒绝调用
 
         Returns:
-            函数返回值
-
-        Raises:
-            Exception: 断路器开启时抛出异常
+            本次调用是否占用了 HALF_OPEN 探测名额（调用结束后需释放）
         """
-        if self.state == CircuitState.OPEN:
+        state = self._state_raw
+        if state is CircuitState.CLOSED:
+            return False
+
+        state = self.state
+        if state is CircuitState.OPEN:
             logger.warning(
                 "circuit_breaker_open",
                 name=self.name,
@@ -119,39 +153,142 @@ class CircuitBreaker:
                 f"Circuit breaker is OPEN (failures: {self._failure_count})",
             )
 
-        try:
-            # 调用函数
-            if asyncio.iscoroutinefunction(func):
+        if state is CircuitState.HALF_OPEN:
+            if (
+                self.half_open_max_concurrent is not None
+                and self._half_open_inflight >= self.half_open_max_concurrent
+            ):
+                raise DataSourceError(
+                    self.name,
+                    f"Circuit breaker is HALF_OPEN (probes in flight: {self._half_open_inflight})",
+                )
+            self._half_open_inflight += 1
+            return True
+
+        return False
+
+    async def acall(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        通过断路器调用协程函数（热路径，无需每次判断函数类型）
+
+        Args:
+            func: 要调用的协程函数
+            *args: 函数参数
+            **kwargs: 函数关键字参数
+
+        Returns:
+            函数返回值
+
+        Raises:
+            Exception: 断路器开启时抛出异常
+        """
+        # 快速路径：CLOSED + 成功是绝大多数流量，跳过状态机与日志
+        if self._state_raw is CircuitState.CLOSED:
+            try:
                 result = await func(*args, **kwargs)
-            else:
-                result = func(*args, **kwargs)
+            except self.expected_exception:
+                self._on_failure()
+                raise
 
-            # 成功：重置计数器
-            self._on_success()
+            self._last_success_time = time.time()
+            if self._failure_count:
+                self._failure_count = 0
             return result
 
-        except self.expected_exception as e:
-            # 失败：增加计数器
+        return await self._slow_acall(func, *args, **kwargs)
+
+    async def _slow_acall(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """非 CLOSED 状态下的完整调用路径（OPEN 拒绝 / HALF_OPEN 探测）"""
+        probing = self._check_open()
+
+        try:
+            result = await func(*args, **kwargs)
+        except self.expected_exception:
+            self._on_failure()
+            raise
+        finally:
+            if probing:
+                self._half_open_inflight -= 1
+
+        self._on_success()
+        return result
+
+    def scall(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        通过断路器调用同步函数
+
+        Args:
+            func: 要调用的函数
+            *args: 函数参数
+            **kwargs: 函数关键字参数
+
+        Returns:
+            函数返回值
+
+        Raises:
+            Exception: 断路器开启时抛出异常
+        """
+        probing = self._check_open()
+
+        try:
+            result = func(*args, **kwargs)
+        except self.expected_exception:
             self._on_failure()
             raise
+        finally:
+            if probing:
+                self._half_open_inflight -= 1
+
+        self._on_success()
+        return result
+
+    async def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        通过断路器调用函数（自动区分协程/同步函数）
+
+        已知函数类型时优先使用 acall/scall，避免每次调用都做类型判断。
+
+        Args:
+            func: 要调用的函数
+            *args: 函数参数
+            **kwargs: 函数关键字参数
+
+        Returns:
+            函数返回值
+
+        Raises:
+            Exception: 断路器开启时抛出异常
+        """
+        if asyncio.iscoroutinefunction(func):
+            return await self.acall(func, *args, **kwargs)
+        return self.scall(func, *args, **kwargs)
 
     def _on_success(self):
         """成功回调"""
-        self._failure_count = 0
-        self._last_success_time = datetime.now()
+        self._last_success_time = time.time()
+
+        if self._state_raw is CircuitState.HALF_OPEN:
+            self._half_open_successes += 1
+            if self._half_open_successes < self.half_open_success_threshold:
+                return
 
-        if self._state == CircuitState.HALF_OPEN:
             logger.info(
                 "circuit_breaker_closed",
                 name=self.name,
                 reason="successful_call_in_half_open",
+                successes=self._half_open_successes,
             )
-            self._state = CircuitState.CLOSED
+            self._state_raw = CircuitState.CLOSED
+            self._half_open_successes = 0
+
+        self._failure_count = 0
 
     def _on_failure(self):
         """失败回调"""
         self._failure_count += 1
-        self._last_failure_time = datetime.now()
+        self._half_open_successes = 0
+        self._last_failure_monotonic = time.monotonic()
+        self._last_failure_time = time.time()
 
         logger.warning(
             "circuit_breaker_failure",
@@ -160,19 +297,24 @@ class CircuitBreaker:
             threshold=self.failure_threshold,
         )
 
-        if self._failure_count >= self.failure_threshold:
+        # HALF_OPEN 下任何一次探测失败都重新开启
+        if (
+            self._state_raw is CircuitState.HALF_OPEN
+            or self._failure_count >= self.failure_threshold
+        ):
             logger.error(
                 "circuit_breaker_opened",
                 name=self.name,
                 failure_count=self._failure_count,
             )
-            self._state = CircuitState.OPEN
+            self._state_raw = CircuitState.OPEN
 
     def reset(self):
         """手动重置断路器"""
         logger.info("circuit_breaker_reset", name=self.name)
-        self._state = CircuitState.CLOSED
+        self._state_raw = CircuitState.CLOSED
         self._failure_count = 0
+        self._half_open_successes = 0
 
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""
@@ -180,15 +322,49 @@ class CircuitBreaker:
             "name": self.name,
             "state": self.state.value,
             "failure_count": self._failure_count,
-            "last_failure_time": self._last_failure_time.isoformat()
-            if self._last_failure_time
-            else None,
-            "last_success_time": self._last_success_time.isoformat()
-            if self._last_success_time
-            else None,
+            "last_failure_time": _format_wall_time(self._last_failure_time),
+            "last_success_time": _format_wall_time(self._last_success_time),
         }
 
 
+# with_retry 支持的退避抖动策略
+RETRY_JITTER_MODES = ("full", "equal", "decorrelated", "none")
+
+
+def _compute_backoff(
+    cap: float,
+    backoff_base: float,
+    max_backoff: float,
+    jitter: str,
+    previous: float,
+) -> float:
+    """
+    计算一次失败后的退避时间（秒）
+
+    Args:
+        cap: 本次指数退避上限，即 min(backoff_base ^ (attempt-1), max_backoff)
+        backoff_base: 退避基数
+        max_backoff: 最大退避时间
+        jitter: 抖动策略
+            - full: uniform(0, cap)，并发重试完全错开
+            - equal: cap/2 + uniform(0, cap/2)，保证最小等待
+            - decorrelated: min(max_backoff, uniform(backoff_base, previous*3))
+            - none: 不抖动（确定性指数退避）
+        previous: 上一次退避时间（decorrelated使用）
+
+    Returns:
+        退避秒数
+    """
+    if jitter == "decorrelated":
+        return min(max_backoff, random.uniform(backoff_base, max(previous, backoff_base) * 3))
+
+    if jitter == "full":
+        return random.uniform(0, cap)
+    if jitter == "equal":
+        return cap / 2 + random.uniform(0, cap / 2)
+    return cap
+
+
 def with_retry(
     max_attempts: int = 3,
     backoff_base: float = 2.0,
@@ -198,16 +374,19 @@ def with_retry(
         DataSourceRateLimitError,
     ),
     no_retry_exceptions: tuple = (DataSourceAuthError,),
+    jitter: str = "full",
 ):
     """
-    重试装饰器（支持指数退避）
+    重试装饰器（支持指数退避 + 抖动）
 
     Args:
         max_attempts: 最大尝试次数
-        backoff_base: 退避基数（每次重试延迟 = backoff_base ^ attempt）
+        backoff_base: 退避基数（每次重试延迟上限 = backoff_base ^ attempt）
         max_backoff: 最大退避时间（秒）
         retry_exceptions: 需要重试的异常类型
         no_retry_exceptions: 不重试的异常类型（直接抛出）
+        jitter: 抖动策略（full/equal/decorrelated/none），默认full，
+            避免大量并发请求在同一时刻重试
 
     Example:
         @with_retry(max_attempts=3, backoff_base=2.0)
@@ -215,71 +394,80 @@ def with_retry(
             ...
     """
 
+    if jitter not in RETRY_JITTER_MODES:
+        raise ValueError(f"Unknown jitter mode: {jitter}")
+
     def decorator(func: Callable) -> Callable:
+        func_name = func.__name__
+        # 闭包内的局部别名，循环中少一次自由变量查找
+        retry_on = retry_exceptions
+        no_retry = no_retry_exceptions
+        # 退避上限表：第 attempt 次失败对应 backoff_table[attempt - 1]
+        backoff_table = [min(backoff_base ** i, max_backoff) for i in range(max_attempts)]
+
         @wraps(func)
         async def async_wrapper(*args, **kwargs) -> Any:
             last_exception = None
+            backoff = backoff_base
 
             for attempt in range(1, max_attempts + 1):
                 try:
-                    # 尝试调用函数
                     result = await func(*args, **kwargs)
                     if attempt > 1:
                         logger.info(
                             "retry_success",
-                            function=func.__name__,
+                            function=func_name,
                             attempt=attempt,
                         )
                     return result
 
-                except no_retry_exceptions as e:
-                    # 不重试的异常，直接抛出
-                    logger.warning(
-                        "no_retry_exception",
-                        function=func.__name__,
-                        exception=type(e).__name__,
-                        message=str(e),
-                    )
-                    raise
-
-                except retry_exceptions as e:
+                except Exception as e:
+                    # 单个 except 分支内按类型分流，避免逐个匹配多个 except 子句
+                    exc_name = type(e).__name__
+                    if isinstance(e, no_retry):
+                        # 不重试的异常，直接抛出
+                        logger.warning(
+                            "no_retry_exception",
+                            function=func_name,
+                            exception=exc_name,
+                            message=e,
+                        )
+                        raise
+
+                    if not isinstance(e, retry_on):
+                        # 未预期的异常不重试
+                        logger.error(
+                            "unexpected_exception",
+                            function=func_name,
+                            attempt=attempt,
+                            exception=exc_name,
+                            message=e,
+                        )
+                        raise
+
                     last_exception = e
                     if attempt < max_attempts:
                         # 计算退避时间
-                        backoff = min(
-                            backoff_base ** (attempt - 1),
-                            max_backoff,
+                        backoff = _compute_backoff(
+                            backoff_table[attempt - 1], backoff_base, max_backoff, jitter, backoff
                         )
                         logger.warning(
                             "retry_attempt",
-                            function=func.__name__,
+                            function=func_name,
                             attempt=attempt,
                             max_attempts=max_attempts,
-                            exception=type(e).__name__,
+                            exception=exc_name,
                             backoff_seconds=backoff,
                         )
                         await asyncio.sleep(backoff)
                     else:
                         logger.error(
                             "retry_exhausted",
-                            function=func.__name__,
+                            function=func_name,
                             attempts=max_attempts,
-                            exception=type(e).__name__,
+                            exception=exc_name,
                         )
 
-                except Exception as e:
-                    # 未预期的异常
-                    last_exception = e
-                    logger.error(
-                        "unexpected_exception",
-                        function=func.__name__,
-                        attempt=attempt,
-                        exception=type(e).__name__,
-                        message=str(e),
-                    )
-                    # 未预期的异常不重试
-                    raise
-
             # 所有重试都失败
             if last_exception:
                 raise last_exception
@@ -288,6 +476,7 @@ def with_retry(
         def sync_wrapper(*args, **kwargs) -> Any:
             """同步函数包装器"""
             last_exception = None
+            backoff = backoff_base
 
             for attempt in range(1, max_attempts + 1):
                 try:
@@ -295,55 +484,59 @@ def with_retry(
                     if attempt > 1:
                         logger.info(
                             "retry_success",
-                            function=func.__name__,
+                            function=func_name,
                             attempt=attempt,
                         )
                     return result
 
-                except no_retry_exceptions as e:
-                    logger.warning(
-                        "no_retry_exception",
-                        function=func.__name__,
-                        exception=type(e).__name__,
-                        message=str(e),
-                    )
-                    raise
+                except Exception as e:
+                    # 单个 except 分支内按类型分流，避免逐个匹配多个 except 子句
+                    exc_name = type(e).__name__
+                    if isinstance(e, no_retry):
+                        # 不重试的异常，直接抛出
+                        logger.warning(
+                            "no_retry_exception",
+                            function=func_name,
+                            exception=exc_name,
+                            message=e,
+                        )
+                        raise
+
+                    if not isinstance(e, retry_on):
+                        # 未预期的异常不重试
+                        logger.error(
+                            "unexpected_exception",
+                            function=func_name,
+                            attempt=attempt,
+                            exception=exc_name,
+                            message=e,
+                        )
+                        raise
 
-                except retry_exceptions as e:
                     last_exception = e
                     if attempt < max_attempts:
-                        backoff = min(
-                            backoff_base ** (attempt - 1),
-                            max_backoff,
+                        # 计算退避时间
+                        backoff = _compute_backoff(
+                            backoff_table[attempt - 1], backoff_base, max_backoff, jitter, backoff
                         )
                         logger.warning(
                             "retry_attempt",
-                            function=func.__name__,
+                            function=func_name,
                             attempt=attempt,
                             max_attempts=max_attempts,
-                            exception=type(e).__name__,
+                            exception=exc_name,
                             backoff_seconds=backoff,
                         )
                         time.sleep(backoff)
                     else:
                         logger.error(
                             "retry_exhausted",
-                            function=func.__name__,
+                            function=func_name,
                             attempts=max_attempts,
-                            exception=type(e).__name__,
+                            exception=exc_name,
                         )
 
-                except Exception as e:
-                    last_exception = e
-                    logger.error(
-                        "unexpected_exception",
-                        function=func.__name__,
-                        attempt=attempt,
-                        exception=type(e).__name__,
-                        message=str(e),
-                    )
-                    raise
-
+            # 所有重试都失败
             if last_exception:
                 raise last_exception
 
@@ -363,6 +556,9 @@ class ErrorAggregator:
     收集和聚合错误信息，用于监控和告警
     """
 
+    # 窗口内最多保留的错误记录数，防止错误风暴时内存无限增长
+    MAX_ERRORS = 100_000
+
     def __init__(self, window_seconds: int = 300):
         """
         初始化错误聚合器
@@ -371,7 +567,11 @@ class ErrorAggregator:
             window_seconds: 时间窗口（秒）
         """
         self.window_seconds = window_seconds
-        self._errors: List[Dict[str, Any]] = []
+        # (单调时钟时间戳, 错误记录)，按时间顺序追加，过期记录总在队首
+        self._errors: deque[Tuple[float, Dict[str, Any]]] = deque()
+        # 窗口内按数据源/异常类型的计数，随记录追加和过期增量维护
+        self._source_counts: Counter = Counter()
+        self._exception_counts: Counter = Counter()
 
     def record_error(
         self,
@@ -388,21 +588,38 @@ class ErrorAggregator:
             endpoint: API端点
         """
         error_record = {
-            "timestamp": datetime.now(),
+            "timestamp": time.time(),
             "source": source,
             "exception_type": type(exception).__name__,
             "message": str(exception),
             "endpoint": endpoint,
         }
-        self._errors.append(error_record)
+        if len(self._errors) >= self.MAX_ERRORS:
+            self._evict_oldest()
+        self._errors.append((time.monotonic(), error_record))
+        self._source_counts[source] += 1
+        self._exception_counts[error_record["exception_type"]] += 1
 
         # 清理过期记录
         self._cleanup_old_errors()
 
     def _cleanup_old_errors(self):
         """清理超出时间窗口的错误记录"""
-        cutoff_time = datetime.now() - timedelta(seconds=self.window_seconds)
-        self._errors = [e for e in self._errors if e["timestamp"] > cutoff_time]
+        cutoff = time.monotonic() - self.window_seconds
+        errors = self._errors
+        while errors and errors[0][0] <= cutoff:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        """移除最早的一条记录并同步扣减计数"""
+        _, old = self._errors.popleft()
+        for counts, key in (
+            (self._source_counts, old["source"]),
+            (self._exception_counts, old["exception_type"]),
+        ):
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
 
     def get_error_rate(self, source: Optional[str] = None) -> float:
         """
@@ -416,40 +633,23 @@ class ErrorAggregator:
         """
         self._cleanup_old_errors()
 
-        if source:
-            errors = [e for e in self._errors if e["source"] == source]
-        else:
-            errors = self._errors
-
-        if not errors:
+        count = self._source_counts[source] if source else len(self._errors)
+        if not count:
             return 0.0
 
         # 计算每分钟错误数
         window_minutes = self.window_seconds / 60
-        return len(errors) / window_minutes
+        return count / window_minutes
 
     def get_error_summary(self) -> Dict[str, Any]:
         """获取错误摘要"""
         self._cleanup_old_errors()
 
-        # 按数据源统计
-        source_counts: Dict[str, int] = {}
-        exception_counts: Dict[str, int] = {}
-
-        for error in self._errors:
-            source = error["source"]
-            exception_type = error["exception_type"]
-
-            source_counts[source] = source_counts.get(source, 0) + 1
-            exception_counts[exception_type] = (
-                exception_counts.get(exception_type, 0) + 1
-            )
-
         return {
             "total_errors": len(self._errors),
             "error_rate_per_minute": self.get_error_rate(),
-            "errors_by_source": source_counts,
-            "errors_by_type": exception_counts,
+            "errors_by_source": dict(self._source_counts),
+            "errors_by_type": dict(self._exception_counts),
             "window_seconds": self.window_seconds,
         }
 
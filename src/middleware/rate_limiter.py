@@ -7,17 +7,19 @@
 - 按数据源的配额管理
 """
 import asyncio
+import math
 import time
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitConfig:
     """速率限制配置"""
 
@@ -36,6 +38,17 @@ class TokenBucket:
     允许突发流量，同时限制平均速率
     """
 
+    __slots__ = (
+        "rate",
+        "_inv_rate",
+        "capacity",
+        "_tokens",
+        "_last_update",
+        "_lock",
+        "_waiters",
+        "_wake_handle",
+    )
+
     def __init__(
         self,
         rate: float,  # 令牌生成速率（每秒）
@@ -49,10 +62,16 @@ class TokenBucket:
             capacity: 桶容量（最大令牌数）
         """
         self.rate = rate
+        # 预先计算倒数，等待时间计算只需乘法
+        self._inv_rate = 1.0 / rate if rate else float("inf")
         self.capacity = capacity
         self._tokens = float(capacity)
-        self._last_update = time.time()
+        # 单调时钟：不受系统时间跳变影响，避免令牌数被回拨/跳变打乱
+        self._last_update = time.monotonic()
         self._lock = asyncio.Lock()
+        # 等待令牌的请求（FIFO），由单个定时回调按令牌累积情况依次唤醒
+        self._waiters: Deque[Tuple[asyncio.Future, int]] = deque()
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
 
     async def acquire(self, tokens: int = 1) -> bool:
         """
@@ -64,18 +83,19 @@ class TokenBucket:
         Returns:
             是否成功获取
         """
-        async with self._lock:
-            self._refill()
-
-            if self._tokens >= tokens:
-                self._tokens -= tokens
-                return True
-            return False
+        # 补充与扣减之间没有 await，单线程事件循环下天然原子，无需加锁
+        if self._would_allow(time.monotonic(), tokens):
+            self._commit(tokens)
+            return True
+        return False
 
     async def wait_for_token(self, tokens: int = 1, timeout: Optional[float] = None):
         """
         等待令牌（阻塞）
 
+        令牌不足时登记为等待者后立即释放锁，由定时回调在令牌足够时
+        直接扣减并唤醒，等待者无需轮询重新竞争锁。
+
         Args:
             tokens: 需要的令牌数
             timeout: 超时时间（秒）
@@ -83,23 +103,72 @@ class TokenBucket:
         Raises:
             asyncio.TimeoutError: 超时
         """
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+
+        async with self._lock:
+            self._refill()
 
-        while True:
-            if await self.acquire(tokens):
+            # 已有等待者时排队，避免插队
+            if not self._waiters and self._tokens >= tokens:
+                self._tokens -= tokens
                 return
 
-            # 检查超时
-            if timeout and (time.time() - start_time) >= timeout:
-                raise asyncio.TimeoutError("Rate limit acquisition timeout")
+            fut = loop.create_future()
+            self._waiters.append((fut, tokens))
+            self._schedule_wake()
+
+        try:
+            await asyncio.wait_for(fut, timeout or None)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError("Rate limit acquisition timeout") from None
+
+    def _schedule_wake(self):
+        """按队首等待者所需令牌安排下一次唤醒"""
+        if self._wake_handle is not None or not self._waiters:
+            return
+
+        _, tokens = self._waiters[0]
+        delay = max(0.0, (tokens - self._tokens) * self._inv_rate)
+        self._wake_handle = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self):
+        """为队首等待者扣减令牌并唤醒（已超时/取消的等待者直接丢弃）"""
+        self._wake_handle = None
+        self._refill()
+
+        waiters = self._waiters
+        while waiters:
+            fut, tokens = waiters[0]
+            if fut.done():
+                waiters.popleft()
+                continue
+            if self._tokens < tokens:
+                break
+            self._tokens -= tokens
+            waiters.popleft()
+            fut.set_result(None)
+
+        self._schedule_wake()
+
+    def _would_allow(self, now: float, tokens: int = 1) -> bool:
+        """补充到 now 时刻并检查令牌是否足够（不扣减）"""
+        self._tokens = min(
+            self._tokens + (now - self._last_update) * self.rate, self.capacity
+        )
+        self._last_update = now
+        return self._tokens >= tokens
+
+    def _commit(self, tokens: int = 1):
+        """扣减令牌（须紧跟在 _would_allow 之后调用）"""
+        self._tokens -= tokens
 
-            # 计算需要等待的时间
-            wait_time = tokens / self.rate
-            await asyncio.sleep(min(wait_time, 0.1))  # 最多等待0.1秒再检查
+    def _refund(self, tokens: int = 1):
+        """归还已扣减的令牌"""
+        self._tokens = min(self._tokens + tokens, self.capacity)
 
     def _refill(self):
         """补充令牌"""
-        now = time.time()
+        now = time.monotonic()
         elapsed = now - self._last_update
 
         # 计算新增令牌数
@@ -107,6 +176,16 @@ class TokenBucket:
         self._tokens = min(self._tokens + new_tokens, self.capacity)
         self._last_update = now
 
+    def pause(self, seconds: float):
+        """
+        清空令牌并暂停发放（用于响应上游429）
+
+        Args:
+            seconds: 暂停时长（秒），之后按正常速率恢复
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
     def get_available_tokens(self) -> float:
         """获取当前可用令牌数"""
         return self._tokens
@@ -125,16 +204,33 @@ class TokenBucket:
             return 0.0
 
         needed_tokens = tokens - self._tokens
-        return needed_tokens / self.rate
+        return needed_tokens * self._inv_rate
 
 
 class SlidingWindowCounter:
     """
-    滑动窗口计数器
+    滑动窗口计数器（双桶近似）
+
+    用于时间窗口限制（如每分钟、每小时、每天）。不逐条记录请求时间戳，
+    只保留上一个与当前固定窗口的计数，按时间加权估算滑动窗口内的请求数：
 
-    用于精确的时间窗口限制（如每分钟、每小时）
+        estimate = prev * (1 - elapsed / window) + curr
+
+    内存与每次检查的开销都是 O(1)，与 max_requests 无关。
     """
 
+    __slots__ = (
+        "window_seconds",
+        "max_requests",
+        "_prev",
+        "_curr",
+        "_epoch_wall",
+        "_epoch_mono",
+        "_window_start",
+        "_last_estimate",
+        "exhausted",
+    )
+
     def __init__(self, window_seconds: int, max_requests: int):
         """
         初始化滑动窗口计数器
@@ -145,8 +241,32 @@ class SlidingWindowCounter:
         """
         self.window_seconds = window_seconds
         self.max_requests = max_requests
-        self._requests: list[float] = []  # 请求时间戳列表
-        self._lock = asyncio.Lock()
+        self._prev = 0  # 上一个固定窗口的请求数
+        self._curr = 0  # 当前固定窗口的请求数
+        # 窗口计时使用单调时钟；记录一对墙钟/单调时钟基准，仅用于换算重置时间
+        self._epoch_wall = time.time()
+        self._epoch_mono = time.monotonic()
+        self._window_start = self._epoch_mono  # 当前固定窗口起点（单调时钟）
+        self._last_estimate = 0.0  # 最近一次 _would_allow 的估算值，供 _commit 与日志复用
+        # 配额是否已耗尽（剩余为0）：计数/拒绝时置位，由 refresh_exhausted 复核清除
+        self.exhausted = False
+
+    def _roll(self, now: float):
+        """推进固定窗口（空闲超过一个窗口时上一窗口计数清零）"""
+        elapsed = now - self._window_start
+        if elapsed < self.window_seconds:
+            return
+
+        windows_passed = int(elapsed // self.window_seconds)
+        self._prev = self._curr if windows_passed == 1 else 0
+        self._curr = 0
+        self._window_start += windows_passed * self.window_seconds
+
+    def _estimate(self, now: float) -> float:
+        """估算滑动窗口内的请求数"""
+        self._roll(now)
+        weight = 1.0 - (now - self._window_start) / self.window_seconds
+        return self._prev * max(0.0, weight) + self._curr
 
     async def check_and_add(self) -> bool:
         """
@@ -155,39 +275,54 @@ class SlidingWindowCounter:
         Returns:
             是否允许请求
         """
-        async with self._lock:
-            now = time.time()
-            cutoff_time = now - self.window_seconds
+        # 检查与计数之间没有 await，单线程事件循环下天然原子，无需加锁
+        now = time.monotonic()
 
-            # 清理过期记录
-            self._requests = [t for t in self._requests if t > cutoff_time]
+        # 检查是否超限
+        if not self._would_allow(now):
+            return False
 
-            # 检查是否超限
-            if len(self._requests) >= self.max_requests:
-                return False
+        # 记录新请求
+        self._commit(now)
+        return True
 
-            # 记录新请求
-            self._requests.append(now)
+    def _would_allow(self, now: float, n: int = 1) -> bool:
+        """检查 now 时刻是否还能再放行 n 个请求（不计数）"""
+        estimate = self._estimate(now)
+        self._last_estimate = estimate
+        if estimate + (n - 1) < self.max_requests:
             return True
+        self.exhausted = True
+        return False
+
+    def _commit(self, now: float, n: int = 1):
+        """计入 n 个请求（须紧跟在 _would_allow 之后调用）"""
+        self._roll(now)
+        self._curr += n
+        # 计数后 ceil(估算值) 达到上限即剩余为0
+        if self._last_estimate + n > self.max_requests - 1:
+            self.exhausted = True
 
     def get_current_count(self) -> int:
-        """获取当前窗口内的请求数"""
-        now = time.time()
-        cutoff_time = now - self.window_seconds
-        self._requests = [t for t in self._requests if t > cutoff_time]
-        return len(self._requests)
+        """获取当前窗口内的请求数（估算值，向上取整）"""
+        return math.ceil(self._estimate(time.monotonic()))
 
     def get_remaining(self) -> int:
         """获取剩余配额"""
         return max(0, self.max_requests - self.get_current_count())
 
+    def refresh_exhausted(self) -> bool:
+        """按当前时间复核耗尽标记（窗口衰减后清除），返回复核结果"""
+        self.exhausted = self.get_remaining() == 0
+        return self.exhausted
+
     def get_reset_time(self) -> Optional[datetime]:
-        """获取重置时间"""
-        if not self._requests:
+        """获取重置时间（当前固定窗口结束，届时本窗口计数开始衰减）"""
+        self._roll(time.monotonic())
+        if not (self._prev or self._curr):
             return None
-        oldest_request = min(self._requests)
-        reset_timestamp = oldest_request + self.window_seconds
-        return datetime.fromtimestamp(reset_timestamp)
+        reset_mono = self._window_start + self.window_seconds
+        return datetime.fromtimestamp(self._epoch_wall + (reset_mono - self._epoch_mono))
 
 
 class RateLimiter:
@@ -197,6 +332,19 @@ class RateLimiter:
     支持同时配置多个时间窗口的限制
     """
 
+    __slots__ = (
+        "name",
+        "config",
+        "token_bucket",
+        "minute_window",
+        "hour_window",
+        "day_window",
+        "_stats_limits",
+        "_stats_windows",
+        "_windows",
+        "_exhausted_sink",
+    )
+
     def __init__(self, name: str, config: RateLimitConfig):
         """
         初始化速率限制器
@@ -239,19 +387,57 @@ class RateLimiter:
                 max_requests=config.requests_per_day,
             )
 
+        # get_stats 的静态部分只构建一次
+        self._stats_limits = {
+            "per_second": config.requests_per_second,
+            "per_minute": config.requests_per_minute,
+            "per_hour": config.requests_per_hour,
+            "per_day": config.requests_per_day,
+            "burst_size": config.burst_size,
+        }
+        self._stats_windows = [
+            (f"{prefix}_used", f"{prefix}_remaining", window)
+            for prefix, window in (
+                ("minute", self.minute_window),
+                ("hour", self.hour_window),
+                ("day", self.day_window),
+            )
+            if window is not None
+        ]
+
+        # 所有已配置的窗口：(限制类型, 计数器, 上限, 耗尽标签)
+        self._windows = [
+            (limit_type, window, limit, f"{name}({label})")
+            for limit_type, label, window, limit in (
+                ("per_minute", "minute", self.minute_window, config.requests_per_minute),
+                ("per_hour", "hour", self.hour_window, config.requests_per_hour),
+                ("per_day", "day", self.day_window, config.requests_per_day),
+            )
+            if window is not None
+        ]
+
+        # 窗口耗尽时登记到此（由注册表注入），健康检查无需遍历全部统计
+        self._exhausted_sink: Optional[Dict[str, SlidingWindowCounter]] = None
+
         logger.info(
             "rate_limiter_initialized",
             name=name,
             config=config,
         )
 
-    async def acquire(self, wait: bool = False, timeout: Optional[float] = None) -> bool:
+    async def acquire(
+        self,
+        wait: bool = False,
+        timeout: Optional[float] = None,
+        count: int = 1,
+    ) -> bool:
         """
         获取速率限制许可
 
         Args:
             wait: 是否等待（阻塞直到获得许可）
             timeout: 等待超时时间（秒）
+            count: 一次获取的许可数（批量请求时一次性检查与扣减）
 
         Returns:
             是否获得许可
@@ -259,87 +445,100 @@ class RateLimiter:
         Raises:
             asyncio.TimeoutError: 等待超时
         """
-        # 检查所有限制
-        if self.token_bucket:
-            if wait:
-                await self.token_bucket.wait_for_token(1, timeout)
-            else:
-                if not await self.token_bucket.acquire(1):
-                    logger.warning(
-                        "rate_limit_exceeded",
-                        name=self.name,
-                        limit_type="per_second",
-                    )
-                    return False
-
-        # 检查分钟限制
-        if self.minute_window:
-            if not await self.minute_window.check_and_add():
-                logger.warning(
-                    "rate_limit_exceeded",
-                    name=self.name,
-                    limit_type="per_minute",
-                    current=self.minute_window.get_current_count(),
-                    max=self.config.requests_per_minute,
-                )
-                return False
+        bucket = self.token_bucket
+        reserved = False
+        if bucket and count > bucket.capacity:
+            # 超过桶容量的批量永远无法满足，等待只会阻塞后续请求
+            return False
+        if bucket and wait:
+            await bucket.wait_for_token(count, timeout)
+            reserved = True
+
+        # 两阶段：先用同一时刻检查所有限制，全部通过后再统一计数，
+        # 避免后面的窗口拒绝时前面的限制已被扣减。检查与提交之间没有 await，
+        # 在事件循环中是原子的，无需再加锁
+        now = time.monotonic()
+
+        if bucket and not reserved and not bucket._would_allow(now, count):
+            logger.warning(
+                "rate_limit_exceeded",
+                name=self.name,
+                limit_type="per_second",
+            )
+            return False
 
-        # 检查小时限制
-        if self.hour_window:
-            if not await self.hour_window.check_and_add():
+        sink = self._exhausted_sink
+        for limit_type, window, limit, label in self._windows:
+            if not window._would_allow(now, count):
+                if reserved:
+                    bucket._refund(count)
+                if sink is not None:
+                    sink[label] = window
                 logger.warning(
                     "rate_limit_exceeded",
                     name=self.name,
-                    limit_type="per_hour",
-                    current=self.hour_window.get_current_count(),
-                    max=self.config.requests_per_hour,
+                    limit_type=limit_type,
+                    current=math.ceil(window._last_estimate),
+                    max=limit,
                 )
                 return False
 
-        # 检查天限制
-        if self.day_window:
-            if not await self.day_window.check_and_add():
-                logger.warning(
-                    "rate_limit_exceeded",
-                    name=self.name,
-                    limit_type="per_day",
-                    current=self.day_window.get_current_count(),
-                    max=self.config.requests_per_day,
-                )
-                return False
+        if bucket and not reserved:
+            bucket._commit(count)
+        for _, window, _, label in self._windows:
+            window._commit(now, count)
+            if window.exhausted and sink is not None:
+                sink[label] = window
 
         return True
 
-    def get_stats(self) -> Dict[str, any]:
-        """获取统计信息"""
-        stats = {
-            "name": self.name,
-            "limits": {
-                "per_second": self.config.requests_per_second,
-                "per_minute": self.config.requests_per_minute,
-                "per_hour": self.config.requests_per_hour,
-                "per_day": self.config.requests_per_day,
-                "burst_size": self.config.burst_size,
-            },
-            "current": {},
-        }
+    async def acquire_many(
+        self,
+        n: int,
+        wait: bool = False,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        为批量请求一次性获取 n 个许可（全部获得或全部拒绝）
 
-        if self.token_bucket:
-            stats["current"]["available_tokens"] = self.token_bucket.get_available_tokens()
+        Args:
+            n: 许可数
+            wait: 是否等待（阻塞直到获得许可）
+            timeout: 等待超时时间（秒）
+
+        Returns:
+            是否获得许可
+        """
+        return await self.acquire(wait, timeout, n)
+
+    def pause(self, seconds: float):
+        """
+        上游返回429时暂停发放许可
+
+        Args:
+            seconds: 暂停时长（秒）
+        """
+        if self.token_bucket and seconds > 0:
+            self.token_bucket.pause(seconds)
+            logger.warning(
+                "rate_limiter_paused",
+                name=self.name,
+                seconds=seconds,
+            )
 
-        if self.minute_window:
-            stats["current"]["minute_used"] = self.minute_window.get_current_count()
-            stats["current"]["minute_remaining"] = self.minute_window.get_remaining()
+    def get_stats(self) -> Dict[str, any]:
+        """获取统计信息（limits 子字典为预构建的共享对象，调用方不应修改）"""
+        current: Dict[str, Any] = {}
 
-        if self.hour_window:
-            stats["current"]["hour_used"] = self.hour_window.get_current_count()
-            stats["current"]["hour_remaining"] = self.hour_window.get_remaining()
+        if self.token_bucket:
+            current["available_tokens"] = self.token_bucket.get_available_tokens()
 
-        if self.day_window:
-            stats["current"]["day_used"] = self.day_window.get_current_count()
-            stats["current"]["day_remaining"] = self.day_window.get_remaining()
+        for used_key, remaining_key, window in self._stats_windows:
+            used = window.get_current_count()
+            current[used_key] = used
+            current[remaining_key] = max(0, window.max_requests - used)
 
-        return stats
+        return {"name": self.name, "limits": self._stats_limits, "current": current}
 
 
 class RateLimiterRegistry:
@@ -390,11 +589,30 @@ class RateLimiterRegistry:
         "brave_search": RateLimitConfig(
             requests_per_month=2000,  # 免费版每月2000次
         ),
+        # Twitter 各端点配额独立，按端点分别限流（"数据源:端点前缀"，见 register_endpoints）
+        "twitter:/tweets/search/recent": RateLimitConfig(
+            requests_per_second=1,  # 450次/15分钟（App认证）
+            burst_size=1,
+        ),
+        "twitter:/tweets/counts/recent": RateLimitConfig(
+            requests_per_second=1,  # 300次/15分钟（App认证）
+            burst_size=1,
+        ),
+        "twitter:/users": RateLimitConfig(
+            requests_per_second=1,  # 300次/15分钟（App认证）
+            burst_size=1,
+        ),
+        "whale_alert": RateLimitConfig(
+            requests_per_second=0.1,  # 免费版约每分钟6-10次
+            burst_size=1,
+        ),
     }
 
     def __init__(self):
         """初始化速率限制器注册表"""
         self._limiters: Dict[str, RateLimiter] = {}
+        # 已耗尽（或曾耗尽、待复核）的窗口：耗尽标签 -> 计数器
+        self._exhausted: Dict[str, SlidingWindowCounter] = {}
 
     def register(
         self,
@@ -414,7 +632,12 @@ class RateLimiterRegistry:
         if config is None:
             config = self.DEFAULT_CONFIGS.get(name, RateLimitConfig())
 
+        # 重复注册时丢弃旧限制器的耗尽记录
+        for label in [k for k in self._exhausted if k.startswith(f"{name}(")]:
+            del self._exhausted[label]
+
         limiter = RateLimiter(name, config)
+        limiter._exhausted_sink = self._exhausted
         self._limiters[name] = limiter
 
         logger.info(
@@ -428,6 +651,55 @@ class RateLimiterRegistry:
         """获取速率限制器"""
         return self._limiters.get(name)
 
+    def register_endpoints(self, name: str) -> List[Tuple[str, RateLimiter]]:
+        """
+        获取（必要时注册）数据源的按端点限制器
+
+        DEFAULT_CONFIGS 中形如 "数据源:端点前缀" 的键为该端点单独的配额，
+        与数据源级限制器互不占用。
+
+        Args:
+            name: 数据源名称
+
+        Returns:
+            [(端点前缀, RateLimiter), ...]，按前缀长度降序（最长前缀优先匹配）
+        """
+        prefix = f"{name}:"
+        endpoints = []
+        for key in self.DEFAULT_CONFIGS:
+            if key.startswith(prefix):
+                limiter = self._limiters.get(key) or self.register(key)
+                endpoints.append((key[len(prefix):], limiter))
+        endpoints.sort(key=lambda item: len(item[0]), reverse=True)
+        return endpoints
+
+    def make_acquire(self, name: str) -> Callable[..., Awaitable[bool]]:
+        """
+        返回指定限制器已绑定的acquire方法
+
+        供调用方在初始化时缓存，热路径上省去注册表查找与属性解析。
+
+        Args:
+            name: 限制器名称（必须已注册）
+
+        Returns:
+            与RateLimiter.acquire签名相同的可调用对象
+        """
+        return self._limiters[name].acquire
+
+    def get_exhausted(self) -> List[str]:
+        """
+        获取当前配额已耗尽的窗口标签（如 "coingecko(minute)"）
+
+        只复核限制器在计数/拒绝时登记的窗口，已随时间恢复的会被移除，
+        开销与耗尽窗口数成正比，而不是与限制器总数成正比。
+        """
+        exhausted = self._exhausted
+        for label, window in list(exhausted.items()):
+            if not window.refresh_exhausted():
+                del exhausted[label]
+        return list(exhausted)
+
     def get_all_stats(self) -> Dict[str, Dict]:
         """获取所有限制器的统计信息"""
         return {name: limiter.get_stats() for name, limiter in self._limiters.items()}
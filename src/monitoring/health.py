@@ -8,7 +8,6 @@
 """
 import asyncio
 import time
-from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
@@ -19,6 +18,20 @@ from src.middleware import global_error_aggregator, global_rate_limiter_registry
 
 logger = structlog.get_logger(__name__)
 
+# 秒级缓存的 UTC ISO 时间戳（liveness 探针高频调用时避免重复构造 datetime）
+_last_ts_sec = 0
+_last_ts_str = ""
+
+
+def _utc_now_iso() -> str:
+    """返回当前 UTC 时间的 ISO 字符串（秒精度，如 2024-01-01T00:00:00Z）"""
+    global _last_ts_sec, _last_ts_str
+    sec = int(time.time())
+    if sec != _last_ts_sec:
+        _last_ts_str = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(sec))
+        _last_ts_sec = sec
+    return _last_ts_str
+
 
 class HealthStatus(Enum):
     """健康状态枚举"""
@@ -35,10 +48,22 @@ class HealthChecker:
     执行全面的系统健康检查
     """
 
+    # 同时进行的数据源健康检查数上限
+    MAX_CONCURRENT_SOURCE_CHECKS = 8
+
+    # 状态严重程度（按状态字符串索引），汇总时取最大值
+    _PRIORITY = {
+        HealthStatus.HEALTHY.value: 0,
+        HealthStatus.DEGRADED.value: 1,
+        HealthStatus.UNHEALTHY.value: 2,
+    }
+    _BY_PRIORITY = (HealthStatus.HEALTHY, HealthStatus.DEGRADED, HealthStatus.UNHEALTHY)
+
     def __init__(
         self,
         data_source_registry: Optional[DataSourceRegistry] = None,
         check_interval_seconds: int = 60,
+        per_source_timeout: float = 2.0,
     ):
         """
         初始化健康检查器
@@ -46,10 +71,13 @@ class HealthChecker:
         Args:
             data_source_registry: 数据源注册表
             check_interval_seconds: 检查间隔（秒）
+            per_source_timeout: 单个数据源健康检查超时（秒），超时视为不健康
         """
         self.registry = data_source_registry
         self.check_interval = check_interval_seconds
-        self._last_check_time: Optional[datetime] = None
+        self.per_source_timeout = per_source_timeout
+        # 缓存计时使用单调时钟；缓存结果直接返回同一对象，调用方只读
+        self._last_check_mono: float = 0.0
         self._cached_result: Optional[Dict[str, Any]] = None
 
     async def check_all(self, use_cache: bool = True) -> Dict[str, Any]:
@@ -60,15 +88,17 @@ class HealthChecker:
             use_cache: 是否使用缓存结果
 
         Returns:
-            健康检查结果字典
+            健康检查结果字典（命中缓存时返回共享对象，调用方不应修改）
         """
         # 检查缓存
-        if use_cache and self._cached_result and self._last_check_time:
-            elapsed = (datetime.now() - self._last_check_time).total_seconds()
-            if elapsed < self.check_interval:
-                return self._cached_result
+        if (
+            use_cache
+            and self._cached_result
+            and time.monotonic() - self._last_check_mono < self.check_interval
+        ):
+            return self._cached_result
 
-        start_time = time.time()
+        start_time = time.monotonic()
 
         # 执行各项检查
         data_sources_health = await self._check_data_sources()
@@ -82,17 +112,17 @@ class HealthChecker:
 
         result = {
             "status": overall_status.value,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _utc_now_iso(),
             "checks": {
                 "data_sources": data_sources_health,
                 "error_rates": error_health,
                 "rate_limiters": rate_limiter_health,
             },
-            "check_duration_ms": round((time.time() - start_time) * 1000, 2),
+            "check_duration_ms": round((time.monotonic() - start_time) * 1000, 2),
         }
 
         # 更新缓存
-        self._last_check_time = datetime.now()
+        self._last_check_mono = time.monotonic()
         self._cached_result = result
 
         logger.info(
@@ -116,22 +146,38 @@ class HealthChecker:
         healthy_count = 0
         total_count = 0
 
-        # 并发检查所有数据源
-        tasks = []
+        # 并发检查所有数据源：信号量限制并发，单个数据源超时不拖慢整体检查
+        sources = []
         source_names = []
 
         for source_name in self.registry.list_providers():
             source = self.registry.get_source(source_name)
             if source and hasattr(source, "health_check"):
-                tasks.append(source.health_check())
+                sources.append(source)
                 source_names.append(source_name)
                 total_count += 1
 
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        if sources:
+            sem = asyncio.Semaphore(min(len(sources), self.MAX_CONCURRENT_SOURCE_CHECKS))
+
+            async def bounded_check(source: Any) -> bool:
+                async with sem:
+                    return await asyncio.wait_for(
+                        source.health_check(), timeout=self.per_source_timeout
+                    )
+
+            results = await asyncio.gather(
+                *(bounded_check(source) for source in sources),
+                return_exceptions=True,
+            )
 
             for name, result in zip(source_names, results):
-                if isinstance(result, Exception):
+                if isinstance(result, asyncio.TimeoutError):
+                    sources_status[name] = {
+                        "healthy": False,
+                        "error": f"health check timed out after {self.per_source_timeout}s",
+                    }
+                elif isinstance(result, Exception):
                     sources_status[name] = {
                         "healthy": False,
                         "error": str(result),
@@ -186,18 +232,8 @@ class HealthChecker:
         """检查速率限制器状态"""
         all_stats = global_rate_limiter_registry.get_all_stats()
 
-        # 检查是否有耗尽的限制器
-        exhausted_limiters = []
-        for name, stats in all_stats.items():
-            current = stats.get("current", {})
-
-            # 检查各种限制
-            if "minute_remaining" in current and current["minute_remaining"] == 0:
-                exhausted_limiters.append(f"{name}(minute)")
-            if "hour_remaining" in current and current["hour_remaining"] == 0:
-                exhausted_limiters.append(f"{name}(hour)")
-            if "day_remaining" in current and current["day_remaining"] == 0:
-                exhausted_limiters.append(f"{name}(day)")
+        # 耗尽的限制器由注册表增量维护，无需逐个扫描统计信息
+        exhausted_limiters = global_rate_limiter_registry.get_exhausted()
 
         # 确定状态
         if not exhausted_limiters:
@@ -219,23 +255,14 @@ class HealthChecker:
         errors: Dict,
         rate_limiters: Dict,
     ) -> HealthStatus:
-        """确定总体健康状态"""
-        statuses = [
-            HealthStatus(data_sources["status"]),
-            HealthStatus(errors["status"]),
-            HealthStatus(rate_limiters["status"]),
-        ]
-
-        # 如果有任何UNHEALTHY，整体为UNHEALTHY
-        if HealthStatus.UNHEALTHY in statuses:
-            return HealthStatus.UNHEALTHY
-
-        # 如果有任何DEGRADED，整体为DEGRADED
-        if HealthStatus.DEGRADED in statuses:
-            return HealthStatus.DEGRADED
-
-        # 否则为HEALTHY
-        return HealthStatus.HEALTHY
+        """确定总体健康状态（取最严重的子状态：UNHEALTHY > DEGRADED > HEALTHY）"""
+        priority = self._PRIORITY
+        worst = max(
+            priority[data_sources["status"]],
+            priority[errors["status"]],
+            priority[rate_limiters["status"]],
+        )
+        return self._BY_PRIORITY[worst]
 
     async def check_single_source(self, source_name: str) -> Dict[str, Any]:
         """
@@ -325,5 +352,5 @@ class HealthChecker:
         """
         return {
             "alive": True,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _utc_now_iso(),
         }
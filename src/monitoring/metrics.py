@@ -7,44 +7,155 @@
 - 活跃请求gauge
 - 错误计数器
 """
-import time
-from collections import defaultdict
+import io
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from datetime import datetime
-from threading import Lock
-from typing import Any, Dict, List, Optional
+from itertools import accumulate
+from math import isfinite
+from threading import Lock, local
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# 直方图对数分桶：观测值按 _LOG_SCALE 放大取整后，每个2的幂区间再均分为
+# 2**_LOG_SUB_BITS 个子桶，相对误差约 1/2**(_LOG_SUB_BITS+1)，内存固定
+_LOG_SCALE = 1000
+_LOG_SUB_BITS = 4
+_LOG_SUB_COUNT = 1 << _LOG_SUB_BITS
+_LOG_BUCKET_COUNT = (64 - _LOG_SUB_BITS + 1) * _LOG_SUB_COUNT
+
+
+def _log_bucket_index(value: float) -> int:
+    """观测值 -> 对数桶下标（O(1)，基于 bit_length）"""
+    v = int(value * _LOG_SCALE)
+    if v < _LOG_SUB_COUNT:
+        return v if v > 0 else 0
+    v = min(v, (1 << 64) - 1)
+    shift = v.bit_length() - 1 - _LOG_SUB_BITS
+    return ((shift + 1) << _LOG_SUB_BITS) + (v >> shift) - _LOG_SUB_COUNT
+
+
+def _log_bucket_bounds(index: int) -> Tuple[float, float]:
+    """对数桶下标 -> [下界, 上界)（原始单位）"""
+    if index < _LOG_SUB_COUNT:
+        lower, width = index, 1
+    else:
+        shift = (index >> _LOG_SUB_BITS) - 1
+        lower = ((index & (_LOG_SUB_COUNT - 1)) + _LOG_SUB_COUNT) << shift
+        width = 1 << shift
+    return lower / _LOG_SCALE, (lower + width) / _LOG_SCALE
+
+
+# 标签组合键：按标签名排序后的 (名, 值) 元组
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _LabeledSeries:
+    """
+    按标签组合派生子序列
+
+    Prometheus 语义下每个标签组合是一条独立序列。父指标本身是无标签序列，
+    各标签组合对应 children 中的子指标，子指标的标签创建后不再变化。
+    """
+
+    def child(self, labels: Dict[str, str]):
+        """获取（必要时创建）标签组合对应的子指标"""
+        key = tuple(sorted(labels.items()))
+        child = self.children.get(key)
+        if child is None:
+            # setdefault 在GIL下是原子的：并发创建时只有一个实例生效
+            child = self.children.setdefault(key, self._new_child(dict(key)))
+        return child
+
+    def series(self) -> List[Any]:
+        """导出用的序列列表（无标签序列仅在有数据或没有子序列时导出）"""
+        children = list(self.children.values())
+        if self._has_data() or not children:
+            return [self, *children]
+        return children
+
+
+class _CounterShard:
+    """计数器的单线程分片"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
 
 @dataclass
-class Counter:
-    """计数器指标"""
+class Counter(_LabeledSeries):
+    """
+    计数器指标
+
+    计数按写入线程分片（threading.local）：每个分片只由所属线程修改，
+    增加无需加锁也不会丢失更新；读取时对所有分片求和。
+    """
 
     name: str
     help_text: str
-    value: int = 0
     labels: Dict[str, str] = field(default_factory=dict)
+    children: Dict[LabelKey, "Counter"] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # 已格式化的Prometheus标签串（标签创建后不变，首次导出时生成）
+    _label_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # 预构建的 # HELP / # TYPE 头（注册时生成，仅指标族本身使用）
+    _header: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._tls = local()
+        # 所有线程的分片（list.append 在GIL下是原子的）
+        self._shards: List[_CounterShard] = []
 
     def inc(self, amount: int = 1):
         """增加计数"""
-        self.value += amount
+        try:
+            shard = self._tls.shard
+        except AttributeError:
+            shard = self._tls.shard = _CounterShard()
+            self._shards.append(shard)
+        shard.value += amount
 
     def get(self) -> int:
         """获取当前值"""
-        return self.value
+        return sum(shard.value for shard in list(self._shards))
+
+    @property
+    def value(self) -> int:
+        """当前值"""
+        return self.get()
+
+    def total(self) -> int:
+        """无标签序列与所有子序列之和"""
+        return self.get() + sum(c.get() for c in list(self.children.values()))
+
+    def _new_child(self, labels: Dict[str, str]) -> "Counter":
+        return Counter(name=self.name, help_text=self.help_text, labels=labels)
+
+    def _has_data(self) -> bool:
+        return self.get() != 0
 
 
 @dataclass
-class Gauge:
+class Gauge(_LabeledSeries):
     """仪表盘指标（可增可减）"""
 
     name: str
     help_text: str
     value: float = 0.0
     labels: Dict[str, str] = field(default_factory=dict)
+    children: Dict[LabelKey, "Gauge"] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _label_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # 预构建的 # HELP / # TYPE 头（注册时生成，仅指标族本身使用）
+    _header: str = field(default="", init=False, repr=False, compare=False)
 
     def set(self, value: float):
         """设置值"""
@@ -62,41 +173,176 @@ class Gauge:
         """获取当前值"""
         return self.value
 
+    def _new_child(self, labels: Dict[str, str]) -> "Gauge":
+        return Gauge(name=self.name, help_text=self.help_text, labels=labels)
+
+    def _has_data(self) -> bool:
+        return self.value != 0
+
+
+class _HistogramShard:
+    """
+    直方图的单线程分片
+
+    每个写入线程独占一个分片，observe 只写本线程的分片，线程间不共享可变状态，
+    读取时把所有分片合并。
+    """
+
+    __slots__ = ("bucket_counts", "log_counts", "sum", "count", "min", "max", "non_finite")
+
+    def __init__(self, bucket_slots: int):
+        # Prometheus 桶按边界区间计数（非累计），导出时再累加
+        self.bucket_counts = [0] * bucket_slots
+        self.log_counts = array("Q", bytes(8 * _LOG_BUCKET_COUNT))
+        self.sum = 0.0
+        self.count = 0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.non_finite = 0  # 被丢弃的 NaN/±inf 观测数
+
+    def observe(self, value: float, bounds: List[float]):
+        """记录观测值"""
+        if not isfinite(value):
+            # NaN/±inf 无法分桶且会污染 sum，只计数不记录
+            self.non_finite += 1
+            return
+        self.bucket_counts[bisect_left(bounds, value)] += 1
+        self.log_counts[_log_bucket_index(value)] += 1
+        self.sum += value
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "_HistogramShard"):
+        """把另一个分片的计数累加到本分片"""
+        self.non_finite += other.non_finite
+        if not other.count:
+            return
+        self.sum += other.sum
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.bucket_counts = [a + b for a, b in zip(self.bucket_counts, other.bucket_counts)]
+        self.log_counts = array("Q", [a + b for a, b in zip(self.log_counts, other.log_counts)])
+
+    def percentile(self, rank: int) -> float:
+        """第 rank 个（从0开始）观测值的估算值"""
+        cumulative = 0
+        for index, n in enumerate(self.log_counts):
+            cumulative += n
+            if cumulative > rank:
+                lower, upper = _log_bucket_bounds(index)
+                return min(max((lower + upper) / 2, self.min), self.max)
+        return self.max
+
 
 @dataclass
-class Histogram:
-    """直方图指标"""
+class Histogram(_LabeledSeries):
+    """
+    直方图指标
+
+    不保存原始观测值，只维护固定数量的对数桶计数，内存恒定；
+    分位数由累计桶计数估算（取桶中点，并限制在实际最小/最大值之间）。
+    计数按写入线程分片（threading.local），读取时合并所有分片。
+    """
 
     name: str
     help_text: str
     buckets: List[float]
     labels: Dict[str, str] = field(default_factory=dict)
-    observations: List[float] = field(default_factory=list)
-    sum: float = 0.0
-    count: int = 0
+    children: Dict[LabelKey, "Histogram"] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _label_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # 预构建的 # HELP / # TYPE 头（注册时生成，仅指标族本身使用）
+    _header: str = field(default="", init=False, repr=False, compare=False)
+    _bucket_prefix_cache: Optional[List[str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        # Prometheus 桶边界只排序一次
+        self._sorted_buckets = sorted(self.buckets)
+        self._tls = local()
+        # 所有线程的分片（list.append 在GIL下是原子的）
+        self._shards: List[_HistogramShard] = []
 
     def observe(self, value: float):
         """记录观测值"""
-        self.observations.append(value)
-        self.sum += value
-        self.count += 1
+        try:
+            shard = self._tls.shard
+        except AttributeError:
+            shard = self._tls.shard = _HistogramShard(len(self._sorted_buckets) + 1)
+            self._shards.append(shard)
+        shard.observe(value, self._sorted_buckets)
+
+    def _snapshot(self) -> _HistogramShard:
+        """合并所有线程分片（只有一个分片时直接返回该分片）"""
+        shards = list(self._shards)
+        if len(shards) == 1:
+            return shards[0]
+
+        total = _HistogramShard(len(self._sorted_buckets) + 1)
+        for shard in shards:
+            total.merge(shard)
+        return total
+
+    @property
+    def sum(self) -> float:
+        """观测值总和"""
+        return self._snapshot().sum
+
+    @property
+    def count(self) -> int:
+        """观测次数"""
+        return self._snapshot().count
 
     def get_buckets(self) -> Dict[float, int]:
-        """获取桶计数"""
-        bucket_counts = {b: 0 for b in self.buckets}
-        bucket_counts[float("inf")] = 0
+        """获取桶计数（累计，le 语义）"""
+        return dict(
+            zip(
+                self._sorted_buckets + [float("inf")],
+                accumulate(self._snapshot().bucket_counts),
+            )
+        )
 
-        for obs in self.observations:
-            for bucket in sorted(self.buckets):
-                if obs <= bucket:
-                    bucket_counts[bucket] += 1
-            bucket_counts[float("inf")] += 1
+    def merged(self) -> "Histogram":
+        """合并无标签序列与所有子序列（没有子序列时返回自身）"""
+        children = list(self.children.values())
+        if not children:
+            return self
+
+        total = _HistogramShard(len(self._sorted_buckets) + 1)
+        for h in (self, *children):
+            for shard in list(h._shards):
+                total.merge(shard)
+
+        merged = Histogram(
+            name=self.name,
+            help_text=self.help_text,
+            buckets=self.buckets,
+            labels=self.labels,
+        )
+        merged._shards.append(total)
+        return merged
+
+    def _new_child(self, labels: Dict[str, str]) -> "Histogram":
+        return Histogram(
+            name=self.name,
+            help_text=self.help_text,
+            buckets=self.buckets,
+            labels=labels,
+        )
 
-        return bucket_counts
+    def _has_data(self) -> bool:
+        return any(shard.count for shard in list(self._shards))
 
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""
-        if not self.observations:
+        snapshot = self._snapshot()
+        if not snapshot.count:
             return {
                 "count": 0,
                 "sum": 0.0,
@@ -106,20 +352,22 @@ class Histogram:
                 "p50": 0.0,
                 "p95": 0.0,
                 "p99": 0.0,
+                "non_finite": snapshot.non_finite,
             }
 
-        sorted_obs = sorted(self.observations)
-        count = len(sorted_obs)
+        count = snapshot.count
+        percentile = snapshot.percentile
 
         return {
             "count": count,
-            "sum": self.sum,
-            "avg": self.sum / count if count > 0 else 0,
-            "min": sorted_obs[0],
-            "max": sorted_obs[-1],
-            "p50": sorted_obs[int(count * 0.5)],
-            "p95": sorted_obs[int(count * 0.95)] if count > 20 else sorted_obs[-1],
-            "p99": sorted_obs[int(count * 0.99)] if count > 100 else sorted_obs[-1],
+            "sum": snapshot.sum,
+            "avg": snapshot.sum / count if count > 0 else 0,
+            "min": snapshot.min,
+            "max": snapshot.max,
+            "p50": percentile(int(count * 0.5)),
+            "p95": percentile(int(count * 0.95)) if count > 20 else snapshot.max,
+            "p99": percentile(int(count * 0.99)) if count > 100 else snapshot.max,
+            "non_finite": snapshot.non_finite,
         }
 
 
@@ -206,18 +454,31 @@ class MetricsCollector:
             "Total number of rate limit exhaustions",
         )
 
+        # 缓存热路径用到的指标引用，记录请求时省去按名称查找
+        self._c_tool_total = self._counters["mcp_tool_requests_total"]
+        self._c_tool_success = self._counters["mcp_tool_requests_success_total"]
+        self._c_tool_failed = self._counters["mcp_tool_requests_failed_total"]
+        self._h_tool_duration = self._histograms["mcp_request_duration_ms"]
+        self._c_source_total = self._counters["data_source_requests_total"]
+        self._c_source_errors = self._counters["data_source_errors_total"]
+        self._h_source_duration = self._histograms["data_source_response_time_ms"]
+
     def register_counter(self, name: str, help_text: str) -> Counter:
         """注册计数器"""
         with self._lock:
             if name not in self._counters:
-                self._counters[name] = Counter(name=name, help_text=help_text)
+                counter = Counter(name=name, help_text=help_text)
+                counter._header = self._build_header(name, help_text, "counter")
+                self._counters[name] = counter
             return self._counters[name]
 
     def register_gauge(self, name: str, help_text: str) -> Gauge:
         """注册仪表盘"""
         with self._lock:
             if name not in self._gauges:
-                self._gauges[name] = Gauge(name=name, help_text=help_text)
+                gauge = Gauge(name=name, help_text=help_text)
+                gauge._header = self._build_header(name, help_text, "gauge")
+                self._gauges[name] = gauge
             return self._gauges[name]
 
     def register_histogram(
@@ -232,28 +493,43 @@ class MetricsCollector:
 
         with self._lock:
             if name not in self._histograms:
-                self._histograms[name] = Histogram(
+                histogram = Histogram(
                     name=name,
                     help_text=help_text,
                     buckets=buckets,
                 )
+                histogram._header = self._build_header(name, help_text, "histogram")
+                self._histograms[name] = histogram
             return self._histograms[name]
 
+    @staticmethod
+    def _build_header(name: str, help_text: str, metric_type: str) -> str:
+        """构建Prometheus # HELP / # TYPE 头"""
+        return f"# HELP {name} {help_text}\n# TYPE {name} {metric_type}\n"
+
+    def get_counter(self, name: str) -> Optional[Counter]:
+        """获取计数器（调用方可缓存返回的对象，直接调用 inc）"""
+        return self._counters.get(name)
+
+    def get_gauge(self, name: str) -> Optional[Gauge]:
+        """获取仪表盘"""
+        return self._gauges.get(name)
+
+    def get_histogram(self, name: str) -> Optional[Histogram]:
+        """获取直方图"""
+        return self._histograms.get(name)
+
     def inc_counter(self, name: str, amount: int = 1, labels: Optional[Dict] = None):
         """增加计数器"""
         counter = self._counters.get(name)
         if counter:
-            counter.inc(amount)
-            if labels:
-                counter.labels.update(labels)
+            (counter.child(labels) if labels else counter).inc(amount)
 
     def set_gauge(self, name: str, value: float, labels: Optional[Dict] = None):
         """设置仪表盘值"""
         gauge = self._gauges.get(name)
         if gauge:
-            gauge.set(value)
-            if labels:
-                gauge.labels.update(labels)
+            (gauge.child(labels) if labels else gauge).set(value)
 
     def observe_histogram(
         self, name: str, value: float, labels: Optional[Dict] = None
@@ -261,9 +537,7 @@ class MetricsCollector:
         """记录直方图观测值"""
         histogram = self._histograms.get(name)
         if histogram:
-            histogram.observe(value)
-            if labels:
-                histogram.labels.update(labels)
+            (histogram.child(labels) if labels else histogram).observe(value)
 
     def record_tool_request(
         self,
@@ -279,20 +553,11 @@ class MetricsCollector:
             duration_ms: 耗时（毫秒）
             success: 是否成功
         """
-        self.inc_counter("mcp_tool_requests_total", labels={"tool": tool_name})
-
-        if success:
-            self.inc_counter(
-                "mcp_tool_requests_success_total", labels={"tool": tool_name}
-            )
-        else:
-            self.inc_counter(
-                "mcp_tool_requests_failed_total", labels={"tool": tool_name}
-            )
+        labels = {"tool": tool_name}
 
-        self.observe_histogram(
-            "mcp_request_duration_ms", duration_ms, labels={"tool": tool_name}
-        )
+        self._c_tool_total.child(labels).inc()
+        (self._c_tool_success if success else self._c_tool_failed).child(labels).inc()
+        self._h_tool_duration.child(labels).observe(duration_ms)
 
     def record_data_source_request(
         self,
@@ -310,58 +575,81 @@ class MetricsCollector:
             success: 是否成功
             error_type: 错误类型（如果失败）
         """
-        self.inc_counter(
-            "data_source_requests_total", labels={"source": source_name}
-        )
+        labels = {"source": source_name}
+
+        self._c_source_total.child(labels).inc()
 
         if not success:
-            self.inc_counter(
-                "data_source_errors_total",
-                labels={"source": source_name, "error_type": error_type or "unknown"},
-            )
+            self._c_source_errors.child(
+                {"source": source_name, "error_type": error_type or "unknown"}
+            ).inc()
 
-        self.observe_histogram(
-            "data_source_response_time_ms",
-            duration_ms,
-            labels={"source": source_name},
-        )
+        self._h_source_duration.child(labels).observe(duration_ms)
+
+    def _snapshot(self) -> Tuple[List[Counter], List[Gauge], List[Histogram]]:
+        """
+        在锁内复制指标列表
+
+        锁只保护注册表结构（注册/重置），读取各指标的值无需加锁，
+        因此导出时仅在复制列表期间持锁，格式化在锁外进行，不阻塞注册。
+        """
+        with self._lock:
+            return (
+                list(self._counters.values()),
+                list(self._gauges.values()),
+                list(self._histograms.values()),
+            )
 
     def get_all_metrics(self) -> Dict[str, Any]:
         """获取所有指标"""
-        with self._lock:
-            metrics = {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "counters": {},
-                "gauges": {},
-                "histograms": {},
+        counters, gauges, histograms = self._snapshot()
+
+        metrics = {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "counters": {},
+            "gauges": {},
+            "histograms": {},
+        }
+
+        # 收集计数器（value 为所有序列之和，series 为各标签组合）
+        for counter in counters:
+            metrics["counters"][counter.name] = {
+                "value": counter.total(),
+                "labels": counter.labels,
+                "help": counter.help_text,
+                "series": [
+                    {"labels": c.labels, "value": c.get()}
+                    for c in list(counter.children.values())
+                ],
+            }
+
+        # 收集仪表盘
+        for gauge in gauges:
+            metrics["gauges"][gauge.name] = {
+                "value": gauge.get(),
+                "labels": gauge.labels,
+                "help": gauge.help_text,
+                "series": [
+                    {"labels": g.labels, "value": g.get()}
+                    for g in list(gauge.children.values())
+                ],
+            }
+
+        # 收集直方图（stats/buckets 为所有序列合并后的结果）
+        for histogram in histograms:
+            merged = histogram.merged()
+            metrics["histograms"][histogram.name] = {
+                "stats": merged.get_stats(),
+                "buckets": merged.get_buckets(),
+                "labels": histogram.labels,
+                "help": histogram.help_text,
+                "series": [
+                    {"labels": h.labels, "stats": h.get_stats()}
+                    for h in list(histogram.children.values())
+                ],
             }
 
-            # 收集计数器
-            for name, counter in self._counters.items():
-                metrics["counters"][name] = {
-                    "value": counter.get(),
-                    "labels": counter.labels,
-                    "help": counter.help_text,
-                }
-
-            # 收集仪表盘
-            for name, gauge in self._gauges.items():
-                metrics["gauges"][name] = {
-                    "value": gauge.get(),
-                    "labels": gauge.labels,
-                    "help": gauge.help_text,
-                }
-
-            # 收集直方图
-            for name, histogram in self._histograms.items():
-                metrics["histograms"][name] = {
-                    "stats": histogram.get_stats(),
-                    "buckets": histogram.get_buckets(),
-                    "labels": histogram.labels,
-                    "help": histogram.help_text,
-                }
-
-            return metrics
+        return metrics
 
     def export_prometheus(self) -> str:
         """
@@ -370,44 +658,65 @@ class MetricsCollector:
         Returns:
             Prometheus文本格式
         """
-        lines = []
-
-        with self._lock:
-            # 导出计数器
-            for counter in self._counters.values():
-                lines.append(f"# HELP {counter.name} {counter.help_text}")
-                lines.append(f"# TYPE {counter.name} counter")
-                label_str = self._format_labels(counter.labels)
-                lines.append(f"{counter.name}{label_str} {counter.value}")
-
-            # 导出仪表盘
-            for gauge in self._gauges.values():
-                lines.append(f"# HELP {gauge.name} {gauge.help_text}")
-                lines.append(f"# TYPE {gauge.name} gauge")
-                label_str = self._format_labels(gauge.labels)
-                lines.append(f"{gauge.name}{label_str} {gauge.value}")
-
-            # 导出直方图
-            for histogram in self._histograms.values():
-                lines.append(f"# HELP {histogram.name} {histogram.help_text}")
-                lines.append(f"# TYPE {histogram.name} histogram")
-                label_str = self._format_labels(histogram.labels)
-
-                # 桶计数
-                buckets = histogram.get_buckets()
-                for bucket, count in sorted(buckets.items()):
-                    bucket_label = (
-                        label_str.rstrip("}") + f',le="{bucket}"}}'
-                        if label_str
-                        else f'{{le="{bucket}"}}'
-                    )
-                    lines.append(f"{histogram.name}_bucket{bucket_label} {count}")
+        counters, gauges, histograms = self._snapshot()
+        out = io.StringIO()
+        write = out.write
+
+        # 导出计数器
+        for counter in counters:
+            write(counter._header)
+            name = counter.name
+            for series in counter.series():
+                write(f"{name}{self._label_str(series)} {series.get()}\n")
+
+        # 导出仪表盘
+        for gauge in gauges:
+            write(gauge._header)
+            name = gauge.name
+            for series in gauge.series():
+                write(f"{name}{self._label_str(series)} {series.get()}\n")
+
+        # 导出直方图
+        for histogram in histograms:
+            write(histogram._header)
+            name = histogram.name
+
+            for series in histogram.series():
+                label_str = self._label_str(series)
+
+                # 各线程分片只合并一次，桶计数/总计/数量都取自同一快照
+                snapshot = series._snapshot()
+
+                # 桶计数（按边界升序，与预构建的行前缀一一对应）
+                bucket_prefixes = self._bucket_line_prefixes(series, label_str)
+                for prefix, count in zip(
+                    bucket_prefixes, accumulate(snapshot.bucket_counts)
+                ):
+                    write(f"{prefix}{count}\n")
 
                 # 总计和数量
-                lines.append(f"{histogram.name}_sum{label_str} {histogram.sum}")
-                lines.append(f"{histogram.name}_count{label_str} {histogram.count}")
-
-        return "\n".join(lines) + "\n"
+                write(f"{name}_sum{label_str} {snapshot.sum}\n")
+                write(f"{name}_count{label_str} {snapshot.count}\n")
+
+        return out.getvalue()
+
+    def _label_str(self, metric: Any) -> str:
+        """获取序列的Prometheus标签串（首次格式化后缓存）"""
+        label_str = metric._label_cache
+        if label_str is None:
+            label_str = metric._label_cache = self._format_labels(metric.labels)
+        return label_str
+
+    def _bucket_line_prefixes(self, histogram: Histogram, label_str: str) -> List[str]:
+        """获取直方图序列各桶（含+Inf）的行前缀，如 'x_bucket{le="10"} '（首次生成后缓存）"""
+        prefixes = histogram._bucket_prefix_cache
+        if prefixes is None:
+            open_labels = label_str[:-1] + "," if label_str else "{"
+            prefixes = histogram._bucket_prefix_cache = [
+                f'{histogram.name}_bucket{open_labels}le="{bucket}"}} '
+                for bucket in histogram._sorted_buckets + [float("inf")]
+            ]
+        return prefixes
 
     def _format_labels(self, labels: Dict[str, str]) -> str:
         """格式化标签为Prometheus格式"""
@@ -423,7 +732,8 @@ class MetricsCollector:
             self._counters.clear()
             self._gauges.clear()
             self._histograms.clear()
-            self._init_default_metrics()
+        # 注册方法自身会加锁（Lock 不可重入），须在锁外重新初始化
+        self._init_default_metrics()
 
 
 # 全局metrics收集器实例
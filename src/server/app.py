@@ -122,6 +122,9 @@ class MCPServer:
         """初始化服务器"""
         logger.info("Initializing MCP server...")
 
+        # 预连接Redis缓存
+        await cache_manager.connect()
+
         # 注册数据源
         await self._register_data_sources()
 
@@ -594,6 +594,7 @@ async def lifespan(app: FastAPI):
     logger.info("Starting MCP HTTP Server...")
 
     # 启动时初始化
+    await cache_manager.connect()
     await initialize_data_sources()
     await initialize_tools()
 
@@ -378,7 +378,7 @@ class MacroHubTool:
         return results, meta
 
     async def _fetch_market_indices(self) -> Tuple[List[IndexData], SourceMeta]:
-        """获取传统市场指数（Yahoo Finance）"""
+        """获取传统市场指数（Yahoo Finance，单次批量请求）"""
         results = []
 
         from src.core.source_meta import SourceMetaBuilder
@@ -388,85 +388,35 @@ class MacroHubTool:
             ttl_seconds=300,
         )
 
-        # 获取股指（含 Russell 2000）
+        # 股指（含 Russell 2000）、大宗商品、美元指数与BTC/ETH一次获取
         try:
-            indices_data, meta = await self.yfinance_client.get_market_indices()
-            for key, quote in indices_data.items():
-                if quote and quote.get("price") is not None:
-                    results.append(IndexData(
-                        name=quote.get("name", key.upper()),
-                        symbol=quote.get("symbol", key),
-                        value=quote["price"],
-                        change_24h=quote.get("change"),
-                        change_percent_24h=quote.get("change_percent"),
-                        timestamp=datetime.utcnow().isoformat() + "Z",
-                    ))
+            snapshot, meta = await self.yfinance_client.get_market_snapshot()
         except Exception as e:
-            logger.warning(f"Failed to fetch market indices from YFinance: {e}")
-
-        # 获取大宗商品
-        try:
-            commodities_data, comm_meta = await self.yfinance_client.get_commodities()
-            for key, quote in commodities_data.items():
-                if quote and quote.get("price") is not None:
-                    results.append(IndexData(
-                        name=quote.get("name", key.upper()),
-                        symbol=quote.get("symbol", key),
-                        value=quote["price"],
-                        change_24h=quote.get("change"),
-                        change_percent_24h=quote.get("change_percent"),
-                        timestamp=datetime.utcnow().isoformat() + "Z",
-                    ))
-            meta = comm_meta
-        except Exception as e:
-            logger.warning(f"Failed to fetch commodities from YFinance: {e}")
-
-        # 获取美元指数
-        try:
-            dxy_data, dxy_meta = await self.yfinance_client.get_dollar_index()
-            if dxy_data and dxy_data.get("price") is not None:
-                results.append(IndexData(
-                    name="US Dollar Index",
-                    symbol=dxy_data.get("symbol", "DX-Y.NYB"),
-                    value=dxy_data["price"],
-                    change_24h=dxy_data.get("change"),
-                    change_percent_24h=dxy_data.get("change_percent"),
-                    timestamp=datetime.utcnow().isoformat() + "Z",
-                ))
-            meta = dxy_meta
-        except Exception as e:
-            logger.warning(f"Failed to fetch DXY from YFinance: {e}")
-
-        # 获取加密货币（BTC/ETH）
-        try:
-            btc_data, btc_meta = await self.yfinance_client.get_quote("BTC-USD")
-            if btc_data and btc_data.get("price") is not None:
-                results.append(IndexData(
-                    name="Bitcoin",
-                    symbol="BTC-USD",
-                    value=btc_data["price"],
-                    change_24h=btc_data.get("change"),
-                    change_percent_24h=btc_data.get("change_percent"),
-                    timestamp=datetime.utcnow().isoformat() + "Z",
-                ))
-            meta = btc_meta
-        except Exception as e:
-            logger.warning(f"Failed to fetch BTC from YFinance: {e}")
-
-        try:
-            eth_data, eth_meta = await self.yfinance_client.get_quote("ETH-USD")
-            if eth_data and eth_data.get("price") is not None:
+            logger.warning(f"Failed to fetch market snapshot from YFinance: {e}")
+            return results, meta
+
+        # (报价, 名称, 默认符号)
+        entries = [
+            (quote, (quote or {}).get("name", key.upper()), key)
+            for group in ("indices", "commodities")
+            for key, quote in snapshot[group].items()
+        ]
+        entries.append((snapshot["dollar_index"], "US Dollar Index", "DX-Y.NYB"))
+        crypto = snapshot["crypto"]
+        entries.append((crypto.get("btc"), "Bitcoin", "BTC-USD"))
+        entries.append((crypto.get("eth"), "Ethereum", "ETH-USD"))
+
+        timestamp = datetime.utcnow().isoformat() + "Z"
+        for quote, name, symbol in entries:
+            if quote and quote.get("price") is not None:
                 results.append(IndexData(
-                    name="Ethereum",
-                    symbol="ETH-USD",
-                    value=eth_data["price"],
-                    change_24h=eth_data.get("change"),
-                    change_percent_24h=eth_data.get("change_percent"),
-                    timestamp=datetime.utcnow().isoformat() + "Z",
+                    name=name,
+                    symbol=quote.get("symbol", symbol),
+                    value=quote["price"],
+                    change_24h=quote.get("change"),
+                    change_percent_24h=quote.get("change_percent"),
+                    timestamp=timestamp,
                 ))
-            meta = eth_meta
-        except Exception as e:
-            logger.warning(f"Failed to fetch ETH from YFinance: {e}")
 
         return results, meta
 
@@ -167,6 +167,10 @@ async def mock_redis() -> AsyncGenerator[MagicMock, None]:
     redis_mock.setex = AsyncMock(return_value=True)
     redis_mock.delete = AsyncMock(return_value=1)
     redis_mock.keys = AsyncMock(return_value=[])
+    # pipeline: execute() 返回 [GET结果, TTL结果]
+    pipeline_mock = MagicMock()
+    pipeline_mock.execute = AsyncMock(return_value=[None, -2])
+    redis_mock.pipeline = MagicMock(return_value=pipeline_mock)
     yield redis_mock
 
 
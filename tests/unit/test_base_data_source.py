@@ -0,0 +1,232 @@
+"""
+BaseDataSource单元测试
+"""
+import asyncio
+from typing import Any, Dict, Optional
+
+import httpx
+import pytest
+
+from src.data_sources import base
+from src.data_sources.base import BaseDataSource, get_shared_transport
+from src.middleware.rate_limiter import RateLimitConfig, RateLimiter
+
+
+class DummySource(BaseDataSource):
+    """测试用数据源"""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="dummy_source", base_url="https://example.test", **kwargs)
+
+    def _get_headers(self) -> Dict[str, str]:
+        return {}
+
+    async def fetch_raw(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        base_url_override: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        return await self._make_request("GET", endpoint, params)
+
+    def transform(self, raw_data: Any, data_type: str) -> Dict[str, Any]:
+        return raw_data
+
+
+def make_source(body: bytes, calls: Optional[list] = None) -> DummySource:
+    """创建返回固定响应体的数据源（calls 记录收到的请求）"""
+    source = DummySource(enable_circuit_breaker=False)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if calls is not None:
+            calls.append(request)
+        return httpx.Response(200, content=body, headers={"content-type": "application/json"})
+
+    transport = httpx.MockTransport(handler)
+    source._client = httpx.AsyncClient(base_url=source.base_url, transport=transport)
+    return source
+
+
+@pytest.mark.unit
+class TestCircuitBreakerConfig:
+    """断路器配置测试"""
+
+    def test_half_open_defaults(self):
+        """默认半开状态需连续2次成功、同时只允许1个探测请求"""
+        breaker = DummySource().circuit_breaker
+
+        assert breaker.half_open_success_threshold == 2
+        assert breaker.half_open_max_concurrent == 1
+
+    def test_half_open_overrides(self):
+        """子类可调整半开策略"""
+        breaker = DummySource(
+            circuit_half_open_success_threshold=3,
+            circuit_half_open_max_concurrent=None,
+        ).circuit_breaker
+
+        assert breaker.half_open_success_threshold == 3
+        assert breaker.half_open_max_concurrent is None
+
+
+@pytest.mark.unit
+class TestJsonParsing:
+    """响应JSON解析测试"""
+
+    @pytest.mark.asyncio
+    async def test_uint256_amount_keeps_precision(self):
+        """超过64位的整数按原值解析，不丢失精度"""
+        amount = 2**256 - 1
+        source = make_source(b'{"amount": %d, "n": 1}' % amount)
+
+        data = await source._make_request("GET", "/balance")
+
+        assert data == {"amount": amount, "n": 1}
+        assert isinstance(data["amount"], int)
+
+    @pytest.mark.asyncio
+    async def test_nan_literal_falls_back(self):
+        """NaN/Infinity 字面量由标准库解析"""
+        source = make_source(b'{"a": NaN, "b": Infinity, "c": 1}')
+
+        data = await source._make_request("GET", "/stats")
+
+        assert data["a"] != data["a"]
+        assert data["b"] == float("inf")
+        assert data["c"] == 1
+
+    @pytest.mark.asyncio
+    async def test_plain_json(self):
+        """普通JSON正常解析"""
+        source = make_source(b'[{"p": "1.5", "v": 3}]')
+
+        assert await source._make_request("GET", "/klines") == [{"p": "1.5", "v": 3}]
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """进程内响应缓存测试"""
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        """默认不缓存，每次 fetch 都发起请求"""
+        calls = []
+        source = make_source(b'{"price": 1}', calls)
+
+        await source.fetch("/price", {"id": "btc"})
+        await source.fetch("/price", {"id": "btc"})
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_opt_in_returns_copy_with_original_timestamp(self):
+        """按次启用缓存：命中返回独立副本，并保留原始获取时间"""
+        calls = []
+        source = make_source(b'{"price": 1, "tags": ["a"]}', calls)
+
+        first, first_meta = await source.fetch("/price", local_cache=True)
+        first["tags"].append("mutated")
+        second, second_meta = await source.fetch("/price", local_cache=True)
+        assert second == {"price": 1, "tags": ["a"]}
+
+        second["price"] = 2
+        third, _ = await source.fetch("/price", local_cache=True)
+
+        assert len(calls) == 1
+        assert third == {"price": 1, "tags": ["a"]}
+        assert second_meta.as_of_utc == first_meta.as_of_utc
+
+    @pytest.mark.asyncio
+    async def test_source_level_opt_in(self):
+        """子类通过 LOCAL_RESPONSE_CACHE 默认启用缓存"""
+        calls = []
+        source = make_source(b'{"price": 1}', calls)
+        source.LOCAL_RESPONSE_CACHE = True
+
+        await source.fetch("/price")
+        await source.fetch("/price")
+        await source.fetch("/price", local_cache=False)
+
+        assert len(calls) == 2
+
+
+@pytest.mark.unit
+class TestFetchRawMany:
+    """批量请求测试"""
+
+    @pytest.mark.asyncio
+    async def test_acquires_permits_in_bucket_sized_batches(self, monkeypatch):
+        """许可按令牌桶容量分批一次性获取，结果按请求顺序返回"""
+        calls = []
+        source = make_source(b'{"ok": 1}', calls)
+        source.rate_limiter = RateLimiter(
+            "dummy_source",
+            RateLimitConfig(requests_per_second=1000, burst_size=2, requests_per_minute=100),
+        )
+        batches = []
+        acquire_many = RateLimiter.acquire_many
+
+        async def spy(self, n, wait=False, timeout=None):
+            batches.append(n)
+            return await acquire_many(self, n, wait, timeout)
+
+        monkeypatch.setattr(RateLimiter, "acquire_many", spy)
+
+        results = await source.fetch_raw_many([(f"/r{i}", None) for i in range(5)])
+
+        assert batches == [2, 2, 1]
+        assert source.rate_limiter.minute_window.get_current_count() == 5
+        assert results == [{"ok": 1}] * 5
+        assert [c.url.path for c in calls] == [f"/r{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_failures_returned_in_place(self):
+        """单个请求失败时以异常对象返回，不影响其他结果"""
+        source = make_source(b'{"ok": 1}')
+        fetch_raw = source.fetch_raw
+
+        async def flaky(endpoint, params=None, base_url_override=None, headers=None):
+            if endpoint == "/bad":
+                raise ValueError("boom")
+            return await fetch_raw(endpoint, params)
+
+        source.fetch_raw = flaky
+
+        results = await source.fetch_raw_many([("/a", None), ("/bad", None)])
+
+        assert results[0] == {"ok": 1}
+        assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.unit
+class TestSharedTransport:
+    """共享传输层测试"""
+
+    def test_transport_per_event_loop(self):
+        """每个事件循环使用各自的传输层，客户端换循环后重建"""
+        source = DummySource(enable_circuit_breaker=False)
+
+        async def grab():
+            return source.client, get_shared_transport()
+
+        client1, transport1 = asyncio.run(grab())
+        client2, transport2 = asyncio.run(grab())
+
+        assert transport1 is not transport2
+        assert client1 is not client2
+
+    @pytest.mark.asyncio
+    async def test_close_closes_own_client_only(self):
+        """close 关闭自身客户端，不关闭共享连接池"""
+        source = DummySource(enable_circuit_breaker=False)
+        other = DummySource(enable_circuit_breaker=False)
+        client = source.client
+        transport = get_shared_transport()
+
+        await source.close()
+
+        assert client.is_closed
+        assert source._client is None
+        assert base._shared_transports.get(asyncio.get_running_loop()) is transport
+        assert not other.client.is_closed
@@ -3,7 +3,9 @@ CacheManager单元测试
 """
 import pytest
 
-from src.middleware.cache import CacheManager
+import asyncio
+
+from src.middleware.cache import CacheManager, SingleFlight, TTLCache
 
 
 @pytest.mark.unit
@@ -42,6 +44,18 @@ class TestCacheManager:
         assert "series" in key
         assert len(key.split(":")) == 3  # tool:capability:hash
 
+    def test_build_cache_key_ignores_param_order(self):
+        """测试参数顺序不影响缓存键"""
+        key1 = CacheManager.build_cache_key(
+            "crypto_overview", "market", {"symbol": "BTC", "vs_currency": "usd"}
+        )
+        key2 = CacheManager.build_cache_key(
+            "crypto_overview", "market", {"vs_currency": "usd", "symbol": "BTC"}
+        )
+
+        assert key1 == key2
+        assert len(key1.split(":")[-1]) == 16  # 64位哈希
+
     @pytest.mark.asyncio
     async def test_get_cache_miss(self, cache):
         """测试缓存未命中"""
@@ -54,11 +68,49 @@ class TestCacheManager:
         import json
 
         test_data = {"price": 95000}
-        mock_redis.get.return_value = json.dumps(test_data)
+        mock_redis.pipeline.return_value.execute.return_value = [json.dumps(test_data), 60]
 
         result = await cache.get("test_key")
         assert result == test_data
 
+    @pytest.mark.asyncio
+    async def test_set_get_roundtrip(self, cache, mock_redis):
+        """测试写入Redis的序列化值可以被读回（含旧JSON格式）"""
+        test_data = {"candles": [{"open": 1.5, "volume": 10}], "count": 1}
+        await cache.set("test_key", test_data, ttl=60)
+        stored = mock_redis.setex.call_args[0][2]
+        cache._l1.clear()
+
+        mock_redis.pipeline.return_value.execute.return_value = [stored, 60]
+        assert await cache.get("test_key") == test_data
+
+        cache._l1.clear()
+        mock_redis.pipeline.return_value.execute.return_value = [b'{"price": 1}', 60]
+        assert await cache.get("test_key") == {"price": 1}
+
+    @pytest.mark.asyncio
+    async def test_get_l1_hit_skips_redis(self, cache, mock_redis):
+        """测试L1命中时不访问Redis，且返回独立副本"""
+        await cache.set("test_key", {"price": 95000}, ttl=60)
+        mock_redis.pipeline.reset_mock()
+
+        first = await cache.get("test_key")
+        first["price"] = 0
+        second = await cache.get("test_key")
+
+        assert second == {"price": 95000}
+        mock_redis.pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_delete_evicts_l1(self, cache, mock_redis):
+        """测试删除时同时清除L1"""
+        await cache.set("test_key", {"price": 95000}, ttl=60)
+
+        await cache.delete("test_key")
+        result = await cache.get("test_key")
+
+        assert result is None
+
     @pytest.mark.asyncio
     async def test_set_cache(self, cache, mock_redis):
         """测试设置缓存"""
@@ -82,11 +134,163 @@ class TestCacheManager:
     @pytest.mark.asyncio
     async def test_invalidate_pattern(self, cache, mock_redis):
         """测试模式匹配删除"""
-        mock_redis.keys.return_value = ["key1", "key2", "key3"]
+        from unittest.mock import AsyncMock
+
+        mock_redis.scan = AsyncMock(side_effect=[(7, ["key1", "key2"]), (0, ["key3"])])
         mock_redis.delete.return_value = 3
 
         count = await cache.invalidate_pattern("crypto_overview:*")
 
         assert count == 3
-        mock_redis.keys.assert_called_once_with("crypto_overview:*")
+        assert mock_redis.scan.call_count == 2
+        mock_redis.scan.assert_any_call(cursor=0, match="crypto_overview:*", count=500)
+        mock_redis.keys.assert_not_called()
         mock_redis.delete.assert_called_once_with("key1", "key2", "key3")
+
+    @staticmethod
+    def _tracking_conn(responses):
+        """构造按顺序返回 responses 的监听连接"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        conn = MagicMock()
+        conn.connect = AsyncMock()
+        conn.send_command = AsyncMock()
+        conn.disconnect = AsyncMock()
+        conn.read_response = AsyncMock(side_effect=responses)
+        return conn
+
+    @pytest.mark.asyncio
+    async def test_tracking_invalidation_evicts_l1(self, cache, mock_redis):
+        """测试收到CLIENT TRACKING失效推送时清除L1，断线后清空L1并重新订阅"""
+        from unittest.mock import MagicMock
+        from redis.exceptions import ResponseError
+
+        await cache.set("key1", {"price": 1}, ttl=60)
+        await cache.set("key2", {"price": 2}, ttl=60)
+
+        evicted = {}
+        first = self._tracking_conn([
+            42,
+            b"OK",
+            [b"subscribe", b"__redis__:invalidate", 1],
+            [b"message", b"__redis__:invalidate", [b"key1"]],
+            None,
+            [b"pong", b""],
+            ConnectionError("closed"),
+        ])
+        first.disconnect.side_effect = lambda: evicted.update(
+            key1=cache._l1.get("key1"), key2=cache._l1.get("key2")
+        )
+        second = self._tracking_conn([
+            43,
+            ResponseError("unknown command"),
+        ])
+        pool = MagicMock()
+        pool.connection_kwargs = {"host": "localhost", "health_check_interval": 30}
+        pool.connection_class = MagicMock(side_effect=[first, second])
+        mock_redis.connection_pool = pool
+        cache.INVALIDATION_RECONNECT_DELAY = 0
+
+        await cache._listen_invalidations()
+
+        # 使用池外独立连接，且关闭自动健康检查
+        pool.connection_class.assert_called_with(host="localhost", health_check_interval=0)
+        pool.get_connection.assert_not_called()
+        first.send_command.assert_any_call(
+            "CLIENT", "TRACKING", "ON", "REDIRECT", 42, "BCAST", "NOLOOP"
+        )
+        first.send_command.assert_any_call("PING")
+        second.send_command.assert_any_call(
+            "CLIENT", "TRACKING", "ON", "REDIRECT", 43, "BCAST", "NOLOOP"
+        )
+        # 推送的键被清除，其余保留；断线后整个L1被清空
+        assert evicted["key1"] is None
+        assert evicted["key2"] is not None
+        assert len(cache._l1) == 0
+        first.disconnect.assert_awaited_once()
+        second.disconnect.assert_awaited_once()
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    """TTLCache测试"""
+
+    def test_get_set(self):
+        """测试基本读写"""
+        cache = TTLCache(maxsize=10)
+        cache.set("a", {"price": 1}, ttl=60)
+
+        assert cache.get("a") == {"price": 1}
+        assert cache.get("missing") is None
+
+    def test_expired_entry(self, monkeypatch):
+        """测试过期条目被丢弃"""
+        import src.middleware.cache as cache_module
+
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+        cache = TTLCache(maxsize=10)
+        cache.set("a", 1, ttl=5)
+        now[0] += 10
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """测试超出容量时淘汰最久未使用的条目"""
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_non_positive_ttl_not_cached(self):
+        """测试TTL<=0时不缓存"""
+        cache = TTLCache()
+        cache.set("a", 1, ttl=0)
+
+        assert cache.get("a") is None
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """SingleFlight测试"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """测试并发同键请求只执行一次"""
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"price": 1}
+
+        results = await asyncio.gather(*[flight.do("BTC", fetch) for _ in range(5)])
+
+        assert calls == 1
+        assert all(r == {"price": 1} for r in results)
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_propagates_and_clears(self):
+        """测试异常传递给所有等待者且不残留"""
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flight.do("BTC", fail), flight.do("BTC", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert len(flight) == 0
@@ -0,0 +1,183 @@
+"""
+错误处理中间件单元测试
+"""
+import asyncio
+import random
+
+import pytest
+
+from src.middleware import error_handler
+from src.middleware.error_handler import (
+    CircuitBreaker,
+    CircuitState,
+    _compute_backoff,
+    with_retry,
+)
+from src.utils.exceptions import DataSourceError
+
+
+async def _ok():
+    return "ok"
+
+
+async def _fail():
+    raise ValueError("boom")
+
+
+async def _trip(breaker: CircuitBreaker):
+    """让断路器进入 OPEN 状态"""
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ValueError):
+            await breaker.acall(_fail)
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """CircuitBreaker测试"""
+
+    @pytest.mark.asyncio
+    async def test_state_transitions(self, monkeypatch):
+        """CLOSED -> OPEN -> HALF_OPEN -> CLOSED"""
+        now = [1000.0]
+        monkeypatch.setattr(error_handler.time, "monotonic", lambda: now[0])
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=30)
+
+        # 未达阈值保持关闭，成功后失败计数清零
+        with pytest.raises(ValueError):
+            await breaker.acall(_fail)
+        await breaker.acall(_ok)
+        with pytest.raises(ValueError):
+            await breaker.acall(_fail)
+        assert breaker.state is CircuitState.CLOSED
+
+        # 连续失败达到阈值后开启，开启期间不调用函数
+        with pytest.raises(ValueError):
+            await breaker.acall(_fail)
+        assert breaker.state is CircuitState.OPEN
+        calls = []
+
+        async def tracked():
+            calls.append(1)
+
+        with pytest.raises(DataSourceError, match="OPEN"):
+            await breaker.acall(tracked)
+        assert calls == []
+
+        # 恢复超时后半开，探测成功后关闭
+        now[0] += 29
+        assert breaker.state is CircuitState.OPEN
+        now[0] += 1
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert await breaker.acall(_ok) == "ok"
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_reset(self):
+        """手动重置回到关闭状态"""
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+        await _trip(breaker)
+        assert breaker.state is CircuitState.OPEN
+
+        breaker.reset()
+
+        assert breaker.state is CircuitState.CLOSED
+        assert await breaker.acall(_ok) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_half_open_requires_consecutive_successes(self):
+        """HALF_OPEN 下连续成功达到阈值才关闭"""
+        breaker = CircuitBreaker(
+            "test", failure_threshold=1, recovery_timeout=0, half_open_success_threshold=2
+        )
+        await _trip(breaker)
+        assert breaker.state is CircuitState.HALF_OPEN
+
+        assert await breaker.acall(_ok) == "ok"
+        assert breaker.state is CircuitState.HALF_OPEN
+
+        assert await breaker.acall(_ok) == "ok"
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_failure_resets_success_count(self):
+        """HALF_OPEN 下探测失败重新开启，成功计数清零"""
+        breaker = CircuitBreaker(
+            "test", failure_threshold=1, recovery_timeout=0, half_open_success_threshold=2
+        )
+        await _trip(breaker)
+        await breaker.acall(_ok)
+
+        with pytest.raises(ValueError):
+            await breaker.acall(_fail)
+        assert breaker._state_raw is CircuitState.OPEN
+
+        await breaker.acall(_ok)
+        assert breaker.state is CircuitState.HALF_OPEN
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_cap(self):
+        """HALF_OPEN 下超出探测上限的请求直接拒绝，探测结束后释放名额"""
+        breaker = CircuitBreaker(
+            "test",
+            failure_threshold=1,
+            recovery_timeout=0,
+            half_open_success_threshold=2,
+            half_open_max_concurrent=1,
+        )
+        await _trip(breaker)
+        release = asyncio.Event()
+
+        async def slow_probe():
+            await release.wait()
+            return "probe"
+
+        probe = asyncio.create_task(breaker.acall(slow_probe))
+        await asyncio.sleep(0)
+        assert breaker._half_open_inflight == 1
+
+        with pytest.raises(DataSourceError, match="HALF_OPEN"):
+            await breaker.acall(_ok)
+
+        release.set()
+        assert await probe == "probe"
+        assert breaker._half_open_inflight == 0
+        assert await breaker.acall(_ok) == "ok"
+        assert breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.unit
+class TestRetryBackoff:
+    """重试退避抖动测试"""
+
+    @pytest.fixture(autouse=True)
+    def seeded(self):
+        """固定随机种子，结果可复现"""
+        random.seed(1234)
+
+    def test_full_jitter_bounds(self):
+        """full: [0, cap]"""
+        samples = [_compute_backoff(8, 2, 60, "full", 2) for _ in range(1000)]
+        assert all(0 <= s <= 8 for s in samples)
+        assert min(samples) < 1 and max(samples) > 7
+
+    def test_equal_jitter_bounds(self):
+        """equal: [cap/2, cap]"""
+        samples = [_compute_backoff(8, 2, 60, "equal", 2) for _ in range(1000)]
+        assert all(4 <= s <= 8 for s in samples)
+
+    def test_decorrelated_jitter_bounds(self):
+        """decorrelated: [base, min(max_backoff, previous*3)]"""
+        samples = [_compute_backoff(8, 2, 60, "decorrelated", 5) for _ in range(1000)]
+        assert all(2 <= s <= 15 for s in samples)
+
+        capped = [_compute_backoff(8, 2, 10, "decorrelated", 50) for _ in range(1000)]
+        assert all(2 <= s <= 10 for s in capped)
+
+    def test_no_jitter(self):
+        """none: 固定返回 cap"""
+        assert _compute_backoff(8, 2, 60, "none", 2) == 8
+
+    def test_unknown_jitter_rejected(self):
+        """未知抖动策略在装饰时报错"""
+        with pytest.raises(ValueError):
+            with_retry(jitter="bogus")
@@ -0,0 +1,216 @@
+"""
+EvidencePersister单元测试
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.middleware.evidence_persister import EvidencePersister
+
+
+@pytest.fixture
+def persister():
+    """不连接真实存储的 EvidencePersister"""
+    return EvidencePersister(
+        postgres_client=MagicMock(),
+        clickhouse_client=MagicMock(),
+        object_store=MagicMock(),
+    )
+
+
+@pytest.mark.unit
+class TestEvidenceHash:
+    """证据哈希测试"""
+
+    def test_hash_matches_canonical_json(self, persister):
+        """哈希与 json.dumps(sort_keys=True) 的历史格式一致"""
+        bundle = {"bundle_id": "b1", "asset": "BTC", "items": [{"tool": "x", "v": 1.5}]}
+
+        expected = hashlib.sha256(json.dumps(bundle, sort_keys=True).encode()).hexdigest()
+
+        assert persister._compute_hash(bundle) == expected
+
+    def test_hash_stable_across_key_order_and_dynamic_fields(self, persister):
+        """键顺序与 hash/persisted_at 不影响哈希"""
+        a = {"asset": "ETH", "bundle_id": "b2", "items": []}
+        b = {
+            "items": [],
+            "bundle_id": "b2",
+            "asset": "ETH",
+            "hash": "stale",
+            "persisted_at": "2024-01-01T00:00:00",
+        }
+
+        assert persister._compute_hash(a) == persister._compute_hash(b)
+
+    def test_hash_stable_for_nested_key_order(self, persister):
+        """嵌套字典的键顺序不影响哈希，且不修改输入"""
+        a = {"bundle_id": "b5", "items": [{"tool": "x", "data": {"p": 1, "q": [1, 2]}}]}
+        b = {"items": [{"data": {"q": [1, 2], "p": 1}, "tool": "x"}], "bundle_id": "b5"}
+        b["hash"] = "stale"
+
+        assert persister._compute_hash(a) == persister._compute_hash(b)
+        assert persister._compute_hash(a) == persister._compute_hash(a)
+        assert b["hash"] == "stale"
+
+    def test_hash_changes_with_content(self, persister):
+        """内容变化时哈希随之变化"""
+        a = {"bundle_id": "b6", "items": [{"v": 1}]}
+        b = {"bundle_id": "b6", "items": [{"v": 2}]}
+
+        assert persister._compute_hash(a) != persister._compute_hash(b)
+
+    def test_hash_handles_datetime_and_int_keys(self, persister):
+        """datetime 值与非字符串键可以序列化，且结果稳定"""
+        as_of = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+        bundle = {"bundle_id": "b3", "as_of": as_of, "levels": {1: "a", 2: "b"}}
+
+        payload, digest = persister._serialize_and_hash(bundle)
+
+        assert digest == hashlib.sha256(payload).hexdigest()
+        assert digest == persister._compute_hash(dict(bundle))
+        decoded = json.loads(payload)
+        assert decoded["as_of"] == str(as_of)
+        assert decoded["levels"] == {"1": "a", "2": "b"}
+
+    def test_splice_snapshot_is_full_bundle(self, persister):
+        """拼接 hash/persisted_at 后的快照与完整 bundle 等价"""
+        bundle = {"bundle_id": "b4", "items": [{"tool": "x"}]}
+        payload, digest = persister._serialize_and_hash(bundle)
+        bundle["hash"] = digest
+        bundle["persisted_at"] = "2024-05-01T12:00:00+00:00"
+
+        snapshot = persister._splice_snapshot(payload, bundle)
+
+        assert json.loads(snapshot) == bundle
+
+
+class FakeClickHouse:
+    """记录写入批次的同步 ClickHouse 客户端，可注入延迟与异常"""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.batches = []
+        self.closed = False
+        self.insert_started = threading.Event()
+
+    def insert_evidence_items(self, columns, column_oriented=False):
+        self.insert_started.set()
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        self.batches.append(columns)
+
+    def close(self):
+        self.closed = True
+
+
+def make_bundle(bundle_id: str, n_items: int = 2) -> dict:
+    """构造带 n_items 条 item 的 EvidenceBundle"""
+    return {
+        "bundle_id": bundle_id,
+        "as_of": "2024-05-01T12:00:00+00:00",
+        "asset": "BTC",
+        "items": [
+            {"tool": f"tool{i}", "as_of_utc": "2024-05-01T12:00:00+00:00"}
+            for i in range(n_items)
+        ],
+    }
+
+
+@pytest.fixture
+def ch_persister():
+    """ClickHouse 使用 FakeClickHouse 的 EvidencePersister 工厂"""
+
+    def build(clickhouse: FakeClickHouse) -> EvidencePersister:
+        object_store = MagicMock()
+        object_store.upload_evidence_bundle_bytes.side_effect = (
+            lambda bundle_id, data: f"s3://evidence-bundles/{bundle_id}.json"
+        )
+        postgres = MagicMock()
+        postgres.insert_evidence_bundle = AsyncMock()
+        postgres.close = AsyncMock()
+        return EvidencePersister(
+            postgres_client=postgres,
+            clickhouse_client=clickhouse,
+            object_store=object_store,
+        )
+
+    return build
+
+
+@pytest.mark.unit
+class TestClickHouseFlusher:
+    """ClickHouse 合并写入测试"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_bundles_share_one_insert(self, ch_persister):
+        """同一窗口内的多个 bundle 合并为一次 insert"""
+        clickhouse = FakeClickHouse()
+        persister = ch_persister(clickhouse)
+
+        uris = await asyncio.gather(*[persister.persist(make_bundle(f"b{i}")) for i in range(3)])
+
+        assert uris == [f"s3://evidence-bundles/b{i}.json" for i in range(3)]
+        assert len(clickhouse.batches) == 1
+        assert clickhouse.batches[0]["bundle_id"] == ["b0", "b0", "b1", "b1", "b2", "b2"]
+        await persister.close()
+
+    @pytest.mark.asyncio
+    async def test_insert_failure_reaches_every_waiter(self, ch_persister):
+        """批次写入失败时，批内每个等待者都收到该异常"""
+        error = RuntimeError("clickhouse down")
+        persister = ch_persister(FakeClickHouse(error=error))
+
+        columns = [
+            persister._build_item_rows(f"b{i}", make_bundle(f"b{i}")["items"])[1]
+            for i in range(3)
+        ]
+
+        results = await asyncio.gather(
+            *[persister._persist_clickhouse(c) for c in columns],
+            return_exceptions=True,
+        )
+
+        assert results == [error, error, error]
+        await persister.close()
+
+    @pytest.mark.asyncio
+    async def test_persist_during_close_finishes(self, ch_persister):
+        """关闭时等待进行中的 insert 与排队批次写完，persist() 正常返回"""
+        clickhouse = FakeClickHouse(delay=0.3)
+        persister = ch_persister(clickhouse)
+
+        first = asyncio.create_task(persister.persist(make_bundle("b1")))
+        while not clickhouse.insert_started.is_set():
+            await asyncio.sleep(0.01)
+        # 第一批 insert 进行中时提交第二批，随后开始关闭
+        second = asyncio.create_task(persister.persist(make_bundle("b2")))
+        await asyncio.sleep(0.05)
+
+        await asyncio.wait_for(persister.close(), timeout=2)
+
+        assert await asyncio.wait_for(first, timeout=1) == "s3://evidence-bundles/b1.json"
+        assert await asyncio.wait_for(second, timeout=1) == "s3://evidence-bundles/b2.json"
+        assert [batch["bundle_id"] for batch in clickhouse.batches] == [
+            ["b1", "b1"],
+            ["b2", "b2"],
+        ]
+        assert clickhouse.closed
+
+    @pytest.mark.asyncio
+    async def test_rejects_writes_after_close(self, ch_persister):
+        """关闭后的 ClickHouse 写入直接失败，不会挂起"""
+        persister = ch_persister(FakeClickHouse())
+        await persister.close()
+
+        _, columns = persister._build_item_rows("b1", make_bundle("b1")["items"])
+        with pytest.raises(RuntimeError, match="closing"):
+            await persister._persist_clickhouse(columns)
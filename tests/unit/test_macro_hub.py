@@ -140,58 +140,50 @@ class TestMacroHubTool:
         """模拟YFinance客户端"""
         client = AsyncMock()
 
-        # 模拟股指数据
-        client.get_market_indices.return_value = (
+        # 模拟行情快照（股指、大宗商品、美元指数、BTC/ETH 一次返回）
+        client.get_market_snapshot.return_value = (
             {
-                "spx": {
-                    "name": "S&P 500",
-                    "symbol": "^GSPC",
-                    "price": 5900.0,
-                    "change": 50.0,
-                    "change_percent": 0.85,
+                "indices": {
+                    "spx": {
+                        "name": "S&P 500",
+                        "symbol": "^GSPC",
+                        "price": 5900.0,
+                        "change": 50.0,
+                        "change_percent": 0.85,
+                    },
+                    "vix": {
+                        "name": "VIX",
+                        "symbol": "^VIX",
+                        "price": 14.5,
+                        "change": -0.5,
+                        "change_percent": -3.33,
+                    },
+                },
+                "commodities": {
+                    "gold": {
+                        "name": "Gold",
+                        "symbol": "GC=F",
+                        "price": 2050.0,
+                        "change": 10.0,
+                        "change_percent": 0.49,
+                    },
+                    "silver": None,
+                },
+                "dollar_index": {
+                    "symbol": "DX-Y.NYB",
+                    "price": 103.5,
+                    "change": -0.2,
+                    "change_percent": -0.19,
+                },
+                "crypto": {
+                    "btc": {
+                        "symbol": "BTC-USD",
+                        "price": 95000.0,
+                        "change": 1000.0,
+                        "change_percent": 1.06,
+                    },
+                    "eth": None,
                 },
-                "vix": {
-                    "name": "VIX",
-                    "symbol": "^VIX",
-                    "price": 14.5,
-                    "change": -0.5,
-                    "change_percent": -3.33,
-                }
-            },
-            SourceMeta(
-                provider="yfinance",
-                endpoint="/v7/finance/quote",
-                as_of_utc="2025-11-18T12:00:00Z",
-                ttl_seconds=300,
-            )
-        )
-
-        # 模拟大宗商品
-        client.get_commodities.return_value = (
-            {
-                "gold": {
-                    "name": "Gold",
-                    "symbol": "GC=F",
-                    "price": 2050.0,
-                    "change": 10.0,
-                    "change_percent": 0.49,
-                }
-            },
-            SourceMeta(
-                provider="yfinance",
-                endpoint="/v7/finance/quote",
-                as_of_utc="2025-11-18T12:00:00Z",
-                ttl_seconds=300,
-            )
-        )
-
-        # 模拟美元指数
-        client.get_dollar_index.return_value = (
-            {
-                "symbol": "DX-Y.NYB",
-                "price": 103.5,
-                "change": -0.2,
-                "change_percent": -0.19,
             },
             SourceMeta(
                 provider="yfinance",
@@ -328,6 +320,24 @@ class TestMacroHubTool:
         symbols = [idx.symbol for idx in result.data.crypto_indices]
         assert "^GSPC" in symbols or "DX-Y.NYB" in symbols
 
+    @pytest.mark.asyncio
+    async def test_market_indices_single_snapshot_request(
+        self, tool_with_all_clients, mock_yfinance_client
+    ):
+        """传统指数通过一次行情快照获取，缺失的报价被跳过"""
+        indices, meta = await tool_with_all_clients._fetch_market_indices()
+
+        mock_yfinance_client.get_market_snapshot.assert_awaited_once()
+        mock_yfinance_client.get_quote.assert_not_called()
+        assert [(i.name, i.symbol) for i in indices] == [
+            ("S&P 500", "^GSPC"),
+            ("VIX", "^VIX"),
+            ("Gold", "GC=F"),
+            ("US Dollar Index", "DX-Y.NYB"),
+            ("Bitcoin", "BTC-USD"),
+        ]
+        assert meta.provider == "yfinance"
+
     @pytest.mark.asyncio
     async def test_indices_mode_without_yfinance_client(self, tool_basic):
         """测试indices模式（无YFinance客户端）"""
@@ -0,0 +1,102 @@
+"""
+Metrics单元测试
+"""
+import threading
+import time
+
+import pytest
+
+from src.monitoring.metrics import Counter, Histogram
+
+
+@pytest.mark.unit
+class TestCounter:
+    """Counter测试"""
+
+    def test_inc_amounts(self):
+        """支持默认、大数值、零、负数与浮点增量"""
+        counter = Counter(name="c", help_text="test")
+
+        counter.inc()
+        counter.inc(0)
+        counter.inc(-1)
+        counter.inc(2.5)
+        assert counter.get() == 2.5
+
+        start = time.perf_counter()
+        counter.inc(10_000_000)
+        assert time.perf_counter() - start < 0.01
+        assert counter.value == 10_000_002.5
+
+    def test_concurrent_inc_no_lost_updates(self):
+        """多线程并发增加不丢失更新"""
+        counter = Counter(name="c", help_text="test")
+
+        def worker():
+            for _ in range(20_000):
+                counter.inc()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert counter.get() == 80_000
+
+    def test_concurrent_get_is_consistent(self):
+        """并发读取时读数单调不减且不超过已写入总数"""
+        counter = Counter(name="c", help_text="test")
+        total = 50_000
+        done = threading.Event()
+        readings = []
+
+        def writer():
+            for _ in range(total):
+                counter.inc()
+            done.set()
+
+        def reader():
+            while not done.is_set():
+                readings.append(counter.get())
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert all(0 <= r <= total for r in readings)
+        assert counter.get() == total
+
+
+@pytest.mark.unit
+class TestHistogram:
+    """Histogram测试"""
+
+    def test_non_finite_values_are_counted_and_dropped(self):
+        """NaN/±inf 不影响桶计数与总和，单独计数"""
+        histogram = Histogram(name="h", help_text="test", buckets=[10, 100])
+
+        histogram.observe(5)
+        histogram.observe(float("nan"))
+        histogram.observe(float("inf"))
+        histogram.observe(float("-inf"))
+        histogram.observe(50)
+
+        stats = histogram.get_stats()
+        assert stats["count"] == 2
+        assert stats["sum"] == 55
+        assert stats["non_finite"] == 3
+        assert histogram.get_buckets() == {10: 1, 100: 2, float("inf"): 2}
+
+    def test_only_non_finite_values(self):
+        """只有非有限值时统计为空"""
+        histogram = Histogram(name="h", help_text="test", buckets=[10])
+
+        histogram.observe(float("nan"))
+
+        stats = histogram.get_stats()
+        assert stats["count"] == 0
+        assert stats["non_finite"] == 1
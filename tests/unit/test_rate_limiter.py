@@ -0,0 +1,148 @@
+"""
+RateLimiter单元测试
+"""
+import asyncio
+
+import pytest
+
+from src.middleware.rate_limiter import (
+    RateLimitConfig,
+    RateLimiter,
+    RateLimiterRegistry,
+    TokenBucket,
+)
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """TokenBucket测试"""
+
+    @pytest.mark.asyncio
+    async def test_waiters_wake_in_fifo_order(self):
+        """等待者按登记顺序获得令牌，需要令牌少的后来者不插队"""
+        bucket = TokenBucket(rate=50, capacity=2)
+        assert await bucket.acquire(2) is True
+        order = []
+
+        async def waiter(name, tokens):
+            await bucket.wait_for_token(tokens, timeout=2)
+            order.append(name)
+
+        tasks = [
+            asyncio.create_task(waiter("big", 2)),
+            asyncio.create_task(waiter("a", 1)),
+            asyncio.create_task(waiter("b", 1)),
+        ]
+        await asyncio.gather(*tasks)
+
+        assert order == ["big", "a", "b"]
+        assert not bucket._waiters
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout(self):
+        """令牌不足且超时时抛出TimeoutError"""
+        bucket = TokenBucket(rate=1, capacity=1)
+        await bucket.acquire()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await bucket.wait_for_token(1, timeout=0.01)
+
+    @pytest.mark.asyncio
+    async def test_pause_drains_and_delays_tokens(self):
+        """pause 清空令牌并按时长预扣，恢复前拒绝请求"""
+        bucket = TokenBucket(rate=10, capacity=5)
+
+        bucket.pause(0.5)
+
+        assert bucket.get_available_tokens() == pytest.approx(-5, abs=0.1)
+        assert await bucket.acquire() is False
+        assert bucket.get_wait_time(1) == pytest.approx(0.6, abs=0.01)
+
+
+@pytest.mark.unit
+class TestRateLimiterBasics:
+    """RateLimiter基础行为测试"""
+
+    @pytest.mark.asyncio
+    async def test_acquire_over_capacity_rejected(self):
+        """超过令牌桶容量的批量立即拒绝，不排队也不扣减窗口"""
+        limiter = RateLimiter(
+            "test",
+            RateLimitConfig(requests_per_second=1, burst_size=2, requests_per_minute=10),
+        )
+
+        assert await limiter.acquire(wait=True, timeout=5, count=3) is False
+
+        assert not limiter.token_bucket._waiters
+        assert limiter.token_bucket.get_available_tokens() == pytest.approx(2, abs=0.01)
+        assert limiter.minute_window.get_current_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_pause_blocks_acquire(self):
+        """上游429后暂停期间不发放许可"""
+        limiter = RateLimiter("test", RateLimitConfig(requests_per_second=10, burst_size=5))
+
+        limiter.pause(1)
+
+        assert await limiter.acquire() is False
+        with pytest.raises(asyncio.TimeoutError):
+            await limiter.acquire(wait=True, timeout=0.05)
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    """RateLimiter测试"""
+
+    @pytest.mark.asyncio
+    async def test_acquire_many_debits_all_limits_once(self):
+        """批量许可一次性从令牌桶与各窗口扣减"""
+        limiter = RateLimiter(
+            "test",
+            RateLimitConfig(requests_per_second=1, burst_size=5, requests_per_minute=10),
+        )
+
+        assert await limiter.acquire_many(4) is True
+
+        assert limiter.token_bucket.get_available_tokens() == pytest.approx(1, abs=0.01)
+        assert limiter.minute_window.get_current_count() == 4
+
+    @pytest.mark.asyncio
+    async def test_acquire_many_all_or_nothing(self):
+        """任一窗口放不下整批时全部拒绝，不扣减任何配额"""
+        limiter = RateLimiter(
+            "test",
+            RateLimitConfig(requests_per_second=100, burst_size=10, requests_per_minute=5),
+        )
+        assert await limiter.acquire_many(3) is True
+
+        assert await limiter.acquire_many(3) is False
+
+        assert limiter.minute_window.get_current_count() == 3
+        assert limiter.token_bucket.get_available_tokens() == pytest.approx(7, abs=0.1)
+        assert await limiter.acquire_many(2) is True
+
+
+@pytest.mark.unit
+class TestRateLimiterRegistry:
+    """RateLimiterRegistry测试"""
+
+    def test_register_endpoints(self, monkeypatch):
+        """按 "数据源:端点前缀" 注册端点限制器，最长前缀优先，重复调用复用实例"""
+        monkeypatch.setattr(
+            RateLimiterRegistry,
+            "DEFAULT_CONFIGS",
+            {
+                "src": RateLimitConfig(requests_per_second=5),
+                "src:/a": RateLimitConfig(requests_per_second=1),
+                "src:/a/b": RateLimitConfig(requests_per_second=2),
+                "other:/a": RateLimitConfig(requests_per_second=3),
+            },
+        )
+        registry = RateLimiterRegistry()
+
+        endpoints = registry.register_endpoints("src")
+
+        assert [prefix for prefix, _ in endpoints] == ["/a/b", "/a"]
+        assert endpoints[0][1] is registry.get("src:/a/b")
+        assert registry.register_endpoints("src")[1][1] is endpoints[1][1]
+        assert registry.register_endpoints("none") == []
@@ -0,0 +1,115 @@
+"""
+TwitterClient单元测试
+"""
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+import pytest
+
+from src.data_sources.twitter import TwitterClient
+from src.data_sources.twitter import client as twitter_module
+from src.middleware.rate_limiter import RateLimiter, RateLimiterRegistry
+
+
+def make_client(calls: list) -> TwitterClient:
+    """创建使用模拟传输层的Twitter客户端"""
+    client = TwitterClient(bearer_token="test-token")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(
+            200,
+            json={"data": [{"id": "1", "text": "btc", "author_id": "u1"}]},
+        )
+
+    client._client = httpx.AsyncClient(
+        base_url=client.base_url, transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+@pytest.mark.unit
+class TestTwitterClient:
+    """TwitterClient测试"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_search_served_from_local_cache(self):
+        """TTL内相同查询复用进程内响应，不重复消耗配额"""
+        calls = []
+        client = make_client(calls)
+        kwargs = {
+            "query": "$BTC",
+            "start_time": "2024-05-01T00:00:00Z",
+            "end_time": "2024-05-01T12:00:00Z",
+        }
+
+        first, first_meta = await client.search_recent_tweets(**kwargs)
+        second, second_meta = await client.search_recent_tweets(**kwargs)
+
+        assert len(calls) == 1
+        assert first == second
+        assert second_meta.as_of_utc == first_meta.as_of_utc
+
+    @pytest.mark.asyncio
+    async def test_different_window_fetches_again(self):
+        """时间窗口不同的查询不命中缓存"""
+        calls = []
+        client = make_client(calls)
+
+        await client.search_recent_tweets("$BTC", end_time="2024-05-01T12:00:00Z")
+        await client.search_recent_tweets("$BTC", end_time="2024-05-01T12:01:00Z")
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_sentiment_within_same_minute_reuses_responses(self, monkeypatch):
+        """end_time 取整到分钟，同一分钟内的重复情绪查询不再请求上游"""
+        now = [datetime(2024, 5, 1, 12, 0, 15)]
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def utcnow(cls):
+                return now[0]
+
+        monkeypatch.setattr(twitter_module, "datetime", FrozenDatetime)
+        calls = []
+        client = make_client(calls)
+
+        first, _ = await client.get_crypto_sentiment("BTC")
+        now[0] = datetime(2024, 5, 1, 12, 0, 55)
+        second, _ = await client.get_crypto_sentiment("BTC")
+
+        assert len(calls) == 2  # 推文搜索 + 数量趋势各一次
+        assert first["timestamp"] == second["timestamp"] == "2024-05-01T12:00:00Z"
+
+    def test_endpoints_have_separate_limiters(self):
+        """搜索、数量趋势与用户端点各自使用独立限制器"""
+        client = make_client([])
+
+        search = client._limiter_for("/tweets/search/recent")
+        counts = client._limiter_for("/tweets/counts/recent")
+        users = client._limiter_for("/users/by/username/elonmusk")
+
+        assert len({id(search), id(counts), id(users), id(client.rate_limiter)}) == 4
+        assert client._limiter_for("/users/123/tweets") is users
+        assert search.name == "twitter:/tweets/search/recent"
+
+    @pytest.mark.asyncio
+    async def test_search_and_counts_not_serialized(self):
+        """并发的搜索与数量趋势请求不互相等待令牌"""
+        client = make_client([])
+        configs = RateLimiterRegistry.DEFAULT_CONFIGS
+        client._endpoint_limiters = [
+            (prefix, RateLimiter(f"twitter:{prefix}", configs[f"twitter:{prefix}"]))
+            for prefix, _ in client._endpoint_limiters
+        ]
+
+        start = time.monotonic()
+        await asyncio.gather(
+            client.search_recent_tweets("$BTC", end_time="2024-05-01T12:00:00Z"),
+            client.get_tweet_counts("$BTC", end_time="2024-05-01T12:00:00Z"),
+        )
+
+        assert time.monotonic() - start < 0.5
@@ -39,7 +39,8 @@ class TestWhaleAlertClient:
     async def test_get_transactions(self, client):
         """测试获取大额转账记录"""
         mock_response = {
-            "transfers": [
+            "result": "success",
+            "transactions": [
                 {
                     "hash": "0x123abc",
                     "timestamp": 1700000000,
@@ -76,7 +77,7 @@ class TestWhaleAlertClient:
         """测试默认时间范围（过去24小时）"""
         with patch.object(client, "fetch") as mock_fetch:
             mock_meta = MagicMock(spec=SourceMeta)
-            mock_fetch.return_value = ({"transfers": []}, mock_meta)
+            mock_fetch.return_value = ({"result": "success", "transactions": []}, mock_meta)
 
             await client.get_transactions(min_value=500000)
 
@@ -95,7 +96,7 @@ class TestWhaleAlertClient:
 
         with patch.object(client, "fetch") as mock_fetch:
             mock_meta = MagicMock(spec=SourceMeta)
-            mock_fetch.return_value = ({"transfers": []}, mock_meta)
+            mock_fetch.return_value = ({"result": "success", "transactions": []}, mock_meta)
 
             data, meta = await client.get_transactions(
                 min_value=500000,
@@ -113,7 +114,7 @@ class TestWhaleAlertClient:
         """测试货币过滤"""
         with patch.object(client, "fetch") as mock_fetch:
             mock_meta = MagicMock(spec=SourceMeta)
-            mock_fetch.return_value = ({"transfers": []}, mock_meta)
+            mock_fetch.return_value = ({"result": "success", "transactions": []}, mock_meta)
 
             await client.get_transactions(min_value=500000, currency="BTC")
 
@@ -240,7 +241,8 @@ class TestWhaleAlertClient:
     async def test_multiple_transfers_aggregation(self, client):
         """测试多笔转账聚合"""
         mock_response = {
-            "transfers": [
+            "result": "success",
+            "transactions": [
                 {
                     "hash": "0x1",
                     "timestamp": 1700000000,
@@ -277,7 +279,8 @@ class TestWhaleAlertClient:
     async def test_transfer_labels_extraction(self, client):
         """测试转账标签提取"""
         mock_response = {
-            "transfers": [
+            "result": "success",
+            "transactions": [
                 {
                     "hash": "0x1",
                     "timestamp": 1700000000,
@@ -305,7 +308,8 @@ class TestWhaleAlertClient:
     async def test_transfer_without_labels(self, client):
         """测试无标签的转账"""
         mock_response = {
-            "transfers": [
+            "result": "success",
+            "transactions": [
                 {
                     "hash": "0x1",
                     "timestamp": 1700000000,
@@ -0,0 +1,66 @@
+"""
+YahooFinanceClient单元测试
+"""
+from unittest.mock import PropertyMock
+
+import pytest
+
+from src.data_sources import yfinance as yfinance_module
+from src.data_sources.yfinance import YahooFinanceClient
+
+
+@pytest.fixture
+def client():
+    """Yahoo Finance客户端"""
+    return YahooFinanceClient()
+
+
+@pytest.mark.unit
+class TestChartTTL:
+    """K线缓存TTL测试"""
+
+    @pytest.fixture(autouse=True)
+    def us_market_closed(self, monkeypatch):
+        """美股休市，距下次开盘约15小时"""
+        monkeypatch.setattr(yfinance_module, "_seconds_until_us_market_open", lambda: 54000)
+
+    @pytest.mark.parametrize("symbol", ["^GSPC", "^IXIC", "^DJI", "^RUT", "^VIX"])
+    def test_us_index_daily_cached_until_open(self, client, symbol):
+        """美股指数日线休市期间缓存到下次开盘"""
+        assert client.chart_ttl(symbol, "1d") == 54000
+
+    @pytest.mark.parametrize(
+        "symbol", ["^N225", "^FTSE", "^HSI", "BP.L", "AAPL", "GC=F", "BTC-USD"]
+    )
+    def test_other_symbols_use_interval_ttl(self, client, symbol):
+        """非美股时段符号（含海外指数与股票）只按间隔TTL缓存"""
+        assert client.chart_ttl(symbol, "1d") == client.CHART_TTL_BY_INTERVAL["1d"]
+
+    def test_intraday_not_extended(self, client):
+        """日内K线不做休市延长"""
+        assert client.chart_ttl("^GSPC", "5m") == 300
+
+
+@pytest.mark.unit
+class TestStaticInfo:
+    """静态信息缓存测试"""
+
+    def test_failure_is_cached_briefly(self, client, monkeypatch):
+        """Ticker.info 失败后短时负缓存，过期后重试"""
+        import src.middleware.cache as cache_module
+
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        info = PropertyMock(side_effect=RuntimeError("quoteSummary 401"))
+        ticker = type("FakeTicker", (), {"info": info})()
+
+        assert client._get_static_info("AAPL", ticker) == {}
+        assert client._get_static_info("AAPL", ticker) == {}
+        assert info.call_count == 1
+
+        now[0] += client.STATIC_INFO_FAILURE_TTL + 1
+        info.side_effect = None
+        info.return_value = {"longName": "Apple Inc.", "fullExchangeName": "NasdaqGS"}
+
+        assert client._get_static_info("AAPL", ticker)["name"] == "Apple Inc."
+        assert info.call_count == 2